@@ -5,6 +5,7 @@ package.domain = org.gua
 
 source.dir = .
 source.include_exts = py,png,jpg,kv,atlas
+source.exclude_dirs = tests
 
 version = 1.0.0
 
@@ -0,0 +1,36 @@
+from kivy.core.window import Window
+from kivy.properties import NumericProperty, StringProperty
+from kivy.uix.image import Image
+from utils.image_cache import image_cache
+
+
+class CachedImage(Image):
+    """Image that loads game artwork through the image cache at the size it is shown.
+
+    display_width is the expected on-screen width in pixels (the window
+    width when 0); label groups the download statistics, usually by screen.
+    """
+
+    url = StringProperty()
+    display_width = NumericProperty(0)
+    label = StringProperty()
+
+    def __init__(self, **kwargs):
+        # Kivy applies kwargs in order; set url last so the first load
+        # already uses the given label and display_width
+        url = kwargs.pop('url', '')
+        super().__init__(**kwargs)
+        self.url = url
+
+    def on_url(self, instance, url):
+        self.texture = None
+        if url:
+            image_cache.load(
+                url, self.display_width or Window.width,
+                lambda texture: self._on_texture(url, texture), self.label
+            )
+
+    def _on_texture(self, url, texture):
+        # A recycled card may show another game by the time this arrives
+        if self.url == url:
+            self.texture = texture
@@ -0,0 +1,295 @@
+import math
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.properties import BooleanProperty, NumericProperty, ObjectProperty, StringProperty
+from kivy.uix.recyclegridlayout import RecycleGridLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.button import MDButton, MDButtonText, MDIconButton
+from kivymd.uix.card import MDCard
+from kivymd.uix.label import MDLabel
+from components.cached_image import CachedImage
+from config import PREFETCH_DELAY
+from utils.prefetch import detail_prefetcher
+
+
+class GameCardBase(RecycleDataViewBehavior):
+    """Shared behaviour of recycled game cards.
+
+    A card widget tree is built once and then rebound to whichever game
+    scrolls into view, so the number of widgets depends on the viewport,
+    not on the number of games.
+    """
+
+    game = ObjectProperty(None, allownone=True)
+    title = StringProperty()
+    image = StringProperty()
+    rating = StringProperty()
+    subtitle = StringProperty()
+    action_text = StringProperty()
+    trailing_icon = StringProperty()
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.game_list = rv
+        self.index = index
+        super().refresh_view_attrs(rv, index, data)
+        self.image_widget.label = rv.image_label
+        self.image_widget.url = self.image
+        self.image_widget.opacity = 1 if self.image else 0
+        self.name_label.text = self.title
+        self.rating_label.text = self.rating
+        self.action_button.opacity = 1 if self.action_text else 0
+        self.action_button.disabled = not self.action_text
+        self.action_label.text = self.action_text
+
+    def select(self):
+        self.game_list.dispatch('on_game_select', self.game)
+
+    def _build_rating(self, icon_size, font_size):
+        rating_box = MDBoxLayout(orientation='horizontal', spacing=dp(3), size_hint_y=None, height=dp(20))
+        star_icon = MDIconButton(icon="star", disabled=True, size_hint=(None, None), size=(dp(icon_size), dp(icon_size)))
+        self.rating_label = MDLabel(font_size=font_size, size_hint_y=None, height=dp(20))
+        rating_box.add_widget(star_icon)
+        rating_box.add_widget(self.rating_label)
+        return rating_box
+
+    def _build_action_button(self, **kwargs):
+        self.action_button = MDButton(style="text", on_release=lambda x: self.select(), **kwargs)
+        self.action_label = MDButtonText()
+        self.action_button.add_widget(self.action_label)
+        return self.action_button
+
+
+class GameRow(GameCardBase, MDCard):
+    """Horizontal card: thumbnail, name, rating, subtitle, action button and optional trailing icon"""
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            orientation='horizontal',
+            padding=dp(8),
+            spacing=dp(10),
+            elevation=2,
+            radius=[10, 10, 10, 10],
+            **kwargs
+        )
+        self.image_widget = CachedImage(size_hint_x=0.3, display_width=dp(120))
+        self.add_widget(self.image_widget)
+
+        info_layout = MDBoxLayout(orientation='vertical', size_hint_x=0.7, spacing=dp(5))
+        self.name_label = MDLabel(font_size="15sp", bold=True, size_hint_y=None, height=dp(30))
+        self.subtitle_label = MDLabel(font_size="12sp", size_hint_y=None, height=dp(20))
+        info_layout.add_widget(self.name_label)
+        info_layout.add_widget(self._build_rating(14, "12sp"))
+        info_layout.add_widget(self.subtitle_label)
+        info_layout.add_widget(self._build_action_button(size_hint_y=None, height=dp(40)))
+        self.add_widget(info_layout)
+
+        self.trailing_button = MDIconButton(on_release=lambda x: self.game_list.dispatch('on_game_trailing', self.game))
+        self.add_widget(self.trailing_button)
+
+    def refresh_view_attrs(self, rv, index, data):
+        super().refresh_view_attrs(rv, index, data)
+        self.subtitle_label.text = self.subtitle
+        self.subtitle_label.height = dp(20) if self.subtitle else 0
+        self.trailing_button.icon = self.trailing_icon or "blank"
+        self.trailing_button.opacity = 1 if self.trailing_icon else 0
+        self.trailing_button.disabled = not self.trailing_icon
+
+
+class GameTile(GameCardBase, MDCard):
+    """Vertical card with a large image; tapping it selects the game unless it has an action button"""
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            orientation='vertical',
+            padding=dp(8),
+            spacing=dp(8),
+            elevation=2,
+            radius=[12, 12, 12, 12],
+            **kwargs
+        )
+        self.image_widget = CachedImage(size_hint_y=0.65)
+        self.add_widget(self.image_widget)
+
+        info_layout = MDBoxLayout(orientation='vertical', size_hint_y=0.25, spacing=dp(3), padding=[dp(5), 0])
+        self.name_label = MDLabel(font_size="14sp", bold=True, size_hint_y=None, height=dp(30))
+        info_layout.add_widget(self.name_label)
+        info_layout.add_widget(self._build_rating(14, "12sp"))
+        self.add_widget(info_layout)
+
+        btn_layout = MDBoxLayout(size_hint_y=0.1, padding=[dp(5), 0])
+        btn_layout.add_widget(self._build_action_button())
+        self.add_widget(btn_layout)
+
+    def refresh_view_attrs(self, rv, index, data):
+        # Fetch artwork for the column width, not the whole window
+        self.image_widget.display_width = rv.column_width()
+        super().refresh_view_attrs(rv, index, data)
+
+    def on_release(self, *args):
+        if not self.action_text:
+            self.select()
+
+
+class GameList(RecycleView):
+    """Virtualized list or grid of game cards.
+
+    Only the cards inside the viewport (plus a small margin) exist as
+    widgets; scrolling rebinds them to other games. Games are plain API or
+    storage dicts; the list turns them into view data with set_games().
+
+    With a pager (utils.pagination.PagedResults) attached, the list asks it
+    for the next page when scrolled within a screen's height of the end,
+    and for the previous one near the top after earlier pages were dropped.
+
+    With prefetch_details, the details of the games in view are cached in
+    the background once the list has been still for PREFETCH_DELAY seconds
+    (see utils.prefetch); scrolling pauses the prefetcher.
+    """
+
+    __events__ = ('on_game_select', 'on_game_trailing')
+
+    cols = NumericProperty(1)
+    card_height = NumericProperty(dp(130))
+    image_key = StringProperty('background_image')
+    name_length = NumericProperty(35)
+    rating_suffix = StringProperty('/5')
+    action_text = StringProperty()
+    trailing_icon = StringProperty()
+    subtitle_func = ObjectProperty(None, allownone=True)
+    pager = ObjectProperty(None, allownone=True)
+    image_label = StringProperty()
+    prefetch_details = BooleanProperty(True)
+
+    def __init__(self, viewclass='GameRow', **kwargs):
+        super().__init__(**kwargs)
+        self._last_scroll_y = 1
+        layout = RecycleGridLayout(
+            cols=self.cols,
+            spacing=dp(10),
+            padding=dp(10),
+            default_size=(None, self.card_height),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        # Adding the layout makes it the layout manager; viewclass is set on it
+        self.add_widget(layout)
+        self.viewclass = GameTile if viewclass == 'GameTile' else GameRow
+        self.bind(scroll_y=self._check_edges)
+        layout.bind(height=self._check_edges)
+        self._prefetch_trigger = Clock.create_trigger(self._prefetch_visible, PREFETCH_DELAY)
+        self.bind(data=self._schedule_prefetch, scroll_y=self._on_scroll)
+
+    def column_width(self):
+        """Width in pixels of one grid column"""
+        layout = self.layout_manager
+        gaps = layout.padding[0] + layout.padding[2] + layout.spacing[0] * (self.cols - 1)
+        return max((self.width - gaps) / self.cols, 1)
+
+    def _item(self, game):
+        """View data for one game"""
+        return {
+            'game': game,
+            'title': str(game.get('name') or 'Unknown')[:self.name_length],
+            'image': game.get(self.image_key) or '',
+            'rating': f"{game.get('rating', 'N/A')}{self.rating_suffix}",
+            'subtitle': self.subtitle_func(game) if self.subtitle_func else '',
+            'action_text': self.action_text,
+            'trailing_icon': self.trailing_icon,
+        }
+
+    def set_games(self, games):
+        """Replace the displayed games and scroll back to the top"""
+        self.data = [self._item(game) for game in games]
+        self.scroll_y = 1
+
+    def add_games(self, games):
+        """Append games without disturbing the current scroll position"""
+        self.data.extend(self._item(game) for game in games)
+
+    def clear_games(self):
+        self.data = []
+        self.scroll_y = 1
+        detail_prefetcher.cancel(self)
+
+    def _on_scroll(self, *args):
+        if self.prefetch_details:
+            detail_prefetcher.pause()
+            self._schedule_prefetch()
+
+    def _schedule_prefetch(self, *args):
+        """(Re)start the wait for the list to settle"""
+        if self.prefetch_details:
+            self._prefetch_trigger.cancel()
+            self._prefetch_trigger()
+
+    def visible_games(self):
+        """Games from the first card in view onwards"""
+        top = (1 - self.scroll_y) * max(self.layout_manager.height - self.height, 0)
+        row_height = self.card_height + self.layout_manager.spacing[1]
+        first_row = max(int((top - self.layout_manager.padding[1]) // row_height), 0)
+        return [item['game'] for item in self.data[first_row * self.cols:]]
+
+    def _prefetch_visible(self, dt):
+        games = self.visible_games()
+        detail_prefetcher.prefetch(self, [game.get('id') for game in games])
+        detail_prefetcher.resume()
+
+    def _check_edges(self, *args):
+        """Ask the pager for more pages when the viewport nears either end"""
+        if self.pager is None or not self.data:
+            return
+        scrollable = self.layout_manager.height - self.height
+        if scrollable <= 0:
+            self.pager.load_next()
+            return
+        scrolling_up = self.scroll_y > self._last_scroll_y
+        self._last_scroll_y = self.scroll_y
+        if self.scroll_y * scrollable < self.height:
+            self.pager.load_next()
+        # Only while scrolling up, so a short window cannot flip back and forth
+        elif scrolling_up and (1 - self.scroll_y) * scrollable < self.height:
+            self.pager.load_previous()
+
+    def _content_height(self, count):
+        """Layout height for count games, before the layout has been redone"""
+        rows = math.ceil(count / self.cols)
+        spacing = self.layout_manager.spacing[1]
+        padding = self.layout_manager.padding
+        return rows * self.card_height + max(rows - 1, 0) * spacing + padding[1] + padding[3]
+
+    def _replace_keeping_position(self, data, shift):
+        """Swap in data without moving the visible cards.
+
+        shift is the height added (positive) or removed (negative) above
+        the viewport.
+        """
+        top = (1 - self.scroll_y) * max(self.layout_manager.height - self.height, 0)
+        scrollable = self._content_height(len(data)) - self.height
+        self.data = data
+        if scrollable > 0:
+            self.scroll_y = min(max(1 - (top + shift) / scrollable, 0), 1)
+
+    def _rows_height(self, count):
+        return math.ceil(count / self.cols) * (self.card_height + self.layout_manager.spacing[1])
+
+    def page_appended(self, games):
+        self.add_games(games)
+
+    def page_prepended(self, games):
+        items = [self._item(game) for game in games]
+        self._replace_keeping_position(items + self.data, self._rows_height(len(items)))
+
+    def head_dropped(self, count):
+        self._replace_keeping_position(self.data[count:], -self._rows_height(count))
+
+    def tail_dropped(self, count):
+        self._replace_keeping_position(self.data[:-count] if count else self.data, 0)
+
+    def on_game_select(self, game):
+        pass
+
+    def on_game_trailing(self, game):
+        pass
@@ -18,3 +18,135 @@ if not RAWG_API_KEY:
     logging.warning(
         "RAWG_API_KEY is not set. API requests that require a key may fail."
     )
+
+# HTTP connection pool. A single keep-alive session is shared by every
+# APIHelper call so screen loads reuse the TCP/TLS connection to RAWG.
+API_POOL_CONNECTIONS = 4     # number of distinct hosts kept in the pool
+API_POOL_MAXSIZE = 8         # max open connections per host
+API_POOL_BLOCK = True        # wait for a free connection instead of opening extras
+API_KEEP_ALIVE = True
+
+# (connect, read) timeouts in seconds. Without these a stalled socket
+# blocks the caller forever.
+API_CONNECT_TIMEOUT = 5
+API_READ_TIMEOUT = 15
+
+# Background worker threads used by AsyncAPIHelper
+API_WORKERS = 4
+
+# Response cache storage: 'sqlite' (single WAL database) or 'file'
+# (one JSON file per entry). Existing JSON files are imported into
+# SQLite the first time the sqlite backend starts.
+CACHE_BACKEND = 'sqlite'
+
+# Response cache budget. When either limit is exceeded on write, entries
+# are evicted using CACHE_EVICTION_POLICY: 'lru' (least recently used),
+# 'lfu' (least frequently used) or 'gdsf' (size-aware greedy-dual).
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+CACHE_MAX_ENTRIES = 2000
+CACHE_EVICTION_POLICY = 'lru'
+
+# Cache payload compression: 'auto' (fastest installed codec: zstd, lz4,
+# then zlib), 'zlib', 'lzma', 'zstd', 'lz4', or None to disable.
+# Payloads smaller than the threshold (bytes) are stored uncompressed.
+CACHE_COMPRESSION = 'auto'
+CACHE_COMPRESSION_THRESHOLD = 2048
+
+# Per-endpoint cache lifetimes in hours. Lists change often, game details
+# rarely. Expired entries younger than CACHE_STALE_GRACE_HOURS past their
+# expiry are still shown immediately while a background refresh runs.
+CACHE_TTL_HOURS = {
+    'games': 6,
+    'search': 12,
+    'game_details': 7 * 24,
+}
+CACHE_STALE_GRACE_HOURS = 3 * 24
+
+# Seconds UserStorage waits before writing changed favorites/history/user
+# data, so bursts of changes are saved in one write.
+STORAGE_FLUSH_DELAY = 1.0
+
+# UserStorage persistence: 'json' (favorites.json, history.json,
+# user_data.json) or 'sqlite' (user_data.db with one row per favorite and
+# history entry). Switching to sqlite imports the JSON files once.
+STORAGE_BACKEND = 'json'
+
+# Number of recently viewed games kept in history
+HISTORY_CAPACITY = 200
+
+# Infinite scroll: result pages kept in memory per list. Pages further
+# away are dropped and re-read from the cache when scrolled back to.
+PAGE_WINDOW = 5
+
+# As-you-type search: seconds to wait after the last keystroke before
+# searching, and the shortest query that triggers a search.
+SEARCH_DEBOUNCE = 0.35
+SEARCH_MIN_CHARS = 2
+
+# Typed searches with at least this many matches in the offline search
+# index are answered locally without asking RAWG. The Search button always
+# asks RAWG.
+SEARCH_INDEX_MIN_RESULTS = 5
+
+# Game artwork. Images are fetched at the smallest of IMAGE_WIDTHS (pixels)
+# that covers the displayed width and kept on disk up to IMAGE_CACHE_MAX_BYTES;
+# decoded textures are kept in memory up to IMAGE_TEXTURE_CACHE_BYTES.
+IMAGE_WIDTHS = (200, 420, 640, 1280)
+IMAGE_CACHE_MAX_BYTES = 100 * 1024 * 1024
+IMAGE_TEXTURE_CACHE_BYTES = 64 * 1024 * 1024
+IMAGE_WORKERS = 4
+
+# Screens are built when first shown. After the first frame these are
+# pre-built one per frame, starting SCREEN_WARMUP_DELAY seconds later;
+# an empty list disables the warm-up.
+SCREEN_WARMUP = ['home', 'search', 'trending', 'profile', 'details']
+SCREEN_WARMUP_DELAY = 0.5
+
+# Detail prefetch. Once a game list has been still for PREFETCH_DELAY
+# seconds, details of the first PREFETCH_COUNT games in view are cached in
+# the background by PREFETCH_WORKERS threads. Scrolling pauses it; metered
+# connections (Android) skip it unless PREFETCH_ON_METERED is set. The
+# metered state is re-checked at most every PREFETCH_METERED_CHECK seconds.
+# Prefetch is low priority: a game is skipped unless the shared API rate
+# limiter holds more than PREFETCH_RESERVE_TOKENS tokens, which are left
+# for foreground requests.
+PREFETCH_ENABLED = True
+PREFETCH_COUNT = 6
+PREFETCH_WORKERS = 2
+PREFETCH_DELAY = 0.6
+PREFETCH_ON_METERED = False
+PREFETCH_METERED_CHECK = 60
+PREFETCH_RESERVE_TOKENS = 5
+
+# Bulk detail fetches (APIHelper.get_game_details_many): at most
+# DETAILS_MANY_CONCURRENCY requests in flight. Like every request they are
+# paced by the shared API_RATE_LIMIT bucket; DETAILS_MANY_RATE is an extra
+# cap on top of it (0 = none), only useful below API_RATE_LIMIT to leave
+# room for foreground requests. Keep the concurrency at or below
+# API_POOL_MAXSIZE.
+DETAILS_MANY_CONCURRENCY = 4
+DETAILS_MANY_RATE = 0
+
+# Pacing and failure handling shared by every APIHelper request.
+# A token bucket allows API_RATE_LIMIT requests per second with bursts of
+# up to API_RATE_BURST. 429, 5xx, timeouts and connection errors are
+# retried up to API_MAX_RETRIES times with exponential backoff and full
+# jitter (API_BACKOFF_BASE seconds doubled per attempt, capped at
+# API_BACKOFF_MAX). A Retry-After header takes precedence and pauses the
+# whole bucket; one longer than API_RETRY_AFTER_MAX is not waited for.
+# After API_BREAKER_THRESHOLD consecutive failures the circuit breaker
+# opens and requests fail fast to cached data for API_BREAKER_RESET
+# seconds, then a single trial request decides whether it closes again.
+API_RATE_LIMIT = 5
+API_RATE_BURST = 10
+API_MAX_RETRIES = 3
+API_BACKOFF_BASE = 0.5
+API_BACKOFF_MAX = 8
+API_RETRY_AFTER_MAX = 30
+API_BREAKER_THRESHOLD = 5
+API_BREAKER_RESET = 30
+
+# Query parameters left out of cache keys and stored entries. The API key
+# does not change a response, so rotating it keeps the cache valid, and
+# it is never written to disk.
+CACHE_KEY_IGNORED_PARAMS = ('key',)
@@ -1,26 +1,28 @@
+import time
+
+# Reference point for the startup measurement; taken before the heavy imports
+PROCESS_START = time.perf_counter()
+
+from utils.startup_profile import startup_profile
+
+startup_profile.start(PROCESS_START)
+
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDIconButton
 from kivymd.uix.label import MDLabel
 from kivymd.uix.screenmanager import MDScreenManager
+from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.core.window import Window
 
-from screens import (
-    HomeScreen,
-    SearchScreen,
-    TrendingScreen,
-    ProfileScreen,
-    SettingsScreen,
-    GameDetailsScreen,
-    LoginScreen,
-    EditProfileScreen,
-    FavoritesScreen,
-    HistoryScreen,
-    NotificationsScreen,
-    DisclaimerScreen,
-)
+import screens
+from config import SCREEN_WARMUP, SCREEN_WARMUP_DELAY
 from utils.storage import storage
+from utils.api_helper import api
+from utils.async_api import async_api
+from utils.image_cache import image_cache
+from utils.prefetch import detail_prefetcher
 import sys
 import traceback
 from datetime import datetime
@@ -28,8 +30,26 @@ from datetime import datetime
 # Mobile window size
 Window.size = (360, 640)
 
+# Screens are imported and built the first time they are shown
+SCREENS = {
+    "disclaimer": "DisclaimerScreen",
+    "home": "HomeScreen",
+    "search": "SearchScreen",
+    "trending": "TrendingScreen",
+    "profile": "ProfileScreen",
+    "settings": "SettingsScreen",
+    "details": "GameDetailsScreen",
+    "login": "LoginScreen",
+    "edit_profile": "EditProfileScreen",
+    "favorites": "FavoritesScreen",
+    "history": "HistoryScreen",
+    "notifications": "NotificationsScreen",
+}
+
 
 class GUAApp(MDApp):
+    startup_time = None
+
     def build(self):
         self.theme_cls.primary_palette = "Blue"
         self.theme_cls.theme_style = "Dark"
@@ -38,27 +58,15 @@ class GUAApp(MDApp):
 
         # Screen manager
         self.sm = MDScreenManager()
-        self.sm.add_widget(DisclaimerScreen(name="disclaimer"))
-        self.sm.add_widget(HomeScreen(name="home"))
-        self.sm.add_widget(SearchScreen(name="search"))
-        self.sm.add_widget(TrendingScreen(name="trending"))
-        self.sm.add_widget(ProfileScreen(name="profile"))
-        self.sm.add_widget(SettingsScreen(name="settings"))
-        self.sm.add_widget(GameDetailsScreen(name="details"))
-        self.sm.add_widget(LoginScreen(name="login"))
-        self.sm.add_widget(EditProfileScreen(name="edit_profile"))
-        self.sm.add_widget(FavoritesScreen(name="favorites"))
-        self.sm.add_widget(HistoryScreen(name="history"))
-        self.sm.add_widget(NotificationsScreen(name="notifications"))
 
         # Check if disclaimer was accepted
         user = storage.get_user()
         if not user or not user.get("disclaimer_accepted", False):
-            self.sm.current = "disclaimer"
+            self.switch_screen("disclaimer")
         elif not storage.is_logged_in():
-            self.sm.current = "login"
+            self.switch_screen("login")
         else:
-            self.sm.current = "home"
+            self.switch_screen("home")
 
         main_layout.add_widget(self.sm)
 
@@ -66,8 +74,49 @@ class GUAApp(MDApp):
         nav_bar = self.create_navigation_bar()
         main_layout.add_widget(nav_bar)
 
+        Window.bind(on_draw=self.on_first_frame)
         return main_layout
 
+    def on_first_frame(self, *args):
+        """Report startup time, then pre-build likely next screens while idle"""
+        Window.unbind(on_draw=self.on_first_frame)
+        self.startup_time = startup_profile.record_first_frame()
+        print(f"Startup: first frame after {self.startup_time * 1000:.0f} ms")
+        self._warmup_queue = [name for name in SCREEN_WARMUP if not self.sm.has_screen(name)]
+        Clock.schedule_once(self.warm_up_next, SCREEN_WARMUP_DELAY)
+
+    def warm_up_next(self, dt):
+        """Build one queued screen per frame so input stays responsive"""
+        if self._warmup_queue:
+            self.get_screen(self._warmup_queue.pop(0))
+            Clock.schedule_once(self.warm_up_next, 0)
+
+    def get_screen(self, name):
+        """Return the named screen, building it on first use"""
+        if not self.sm.has_screen(name):
+            started = time.perf_counter()
+            screen_class = getattr(screens, SCREENS[name])
+            imported = time.perf_counter()
+            self.sm.add_widget(screen_class(name=name))
+            startup_profile.record_screen(name, imported - started, time.perf_counter() - imported)
+        return self.sm.get_screen(name)
+
+    def refresh_screen(self, name):
+        """Rebuild a screen's UI if it has been built; otherwise it is built fresh when shown"""
+        if self.sm.has_screen(name):
+            self.sm.get_screen(name).refresh_ui()
+
+    def on_stop(self):
+        print(f"Detail prefetch: {detail_prefetcher.get_stats()}")
+        print(f"API: {api.get_stats()}")
+        async_api.shutdown()
+        detail_prefetcher.shutdown()
+        image_cache.shutdown()
+        api.close()
+        storage.flush()
+        if startup_profile.enabled:
+            startup_profile.write()
+
     def create_navigation_bar(self):
         nav_bar = MDBoxLayout(size_hint_y=None, height=dp(65), padding=[dp(10), dp(5)])
 
@@ -98,10 +147,11 @@ class GUAApp(MDApp):
         return nav_bar
 
     def switch_screen(self, screen_name):
+        self.get_screen(screen_name)
         self.sm.current = screen_name
 
     def show_game_details(self, game_id):
-        details_screen = self.sm.get_screen("details")
+        details_screen = self.get_screen("details")
         details_screen.load_game_details(game_id)
         self.sm.current = "details"
 
@@ -1,27 +1,32 @@
-from .home_screen import HomeScreen
-from .search_screen import SearchScreen
-from .trending_screen import TrendingScreen
-from .profile_screen import ProfileScreen
-from .settings_screen import SettingsScreen
-from .game_details_screen import GameDetailsScreen
-from .login_screen import LoginScreen
-from .edit_profile_screen import EditProfileScreen
-from .favorites_screen import FavoritesScreen
-from .history_screen import HistoryScreen
-from .notifications_screen import NotificationsScreen
-from .disclaimer_screen import DisclaimerScreen
+from importlib import import_module
 
-__all__ = [
-    'HomeScreen',
-    'SearchScreen',
-    'TrendingScreen',
-    'ProfileScreen',
-    'SettingsScreen',
-    'GameDetailsScreen',
-    'LoginScreen',
-    'EditProfileScreen',
-    'FavoritesScreen',
-    'HistoryScreen',
-    'NotificationsScreen',
-    'DisclaimerScreen'
-]
+# Screen modules are imported the first time their class is looked up
+# (PEP 562), so startup only pays for the screens it actually shows.
+_MODULES = {
+    'HomeScreen': 'home_screen',
+    'SearchScreen': 'search_screen',
+    'TrendingScreen': 'trending_screen',
+    'ProfileScreen': 'profile_screen',
+    'SettingsScreen': 'settings_screen',
+    'GameDetailsScreen': 'game_details_screen',
+    'LoginScreen': 'login_screen',
+    'EditProfileScreen': 'edit_profile_screen',
+    'FavoritesScreen': 'favorites_screen',
+    'HistoryScreen': 'history_screen',
+    'NotificationsScreen': 'notifications_screen',
+    'DisclaimerScreen': 'disclaimer_screen',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    screen_class = getattr(import_module(f'.{_MODULES[name]}', __name__), name)
+    globals()[name] = screen_class
+    return screen_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
@@ -186,8 +186,7 @@ class EditProfileScreen(MDScreen):
         
         # Refresh profile screen
         app = MDApp.get_running_app()
-        profile_screen = app.sm.get_screen('profile')
-        profile_screen.refresh_ui()
+        app.refresh_screen('profile')
         
         # Navigate back after short delay
         from kivy.clock import Clock
@@ -6,10 +6,10 @@ from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDIconButton
 from kivymd.uix.appbar import MDTopAppBar
-from kivy.uix.image import AsyncImage
 from kivy.metrics import dp
-from kivy.clock import Clock
-from utils.api_helper import api
+from components.cached_image import CachedImage
+from utils.async_api import async_api
+from utils.prefetch import detail_prefetcher
 from utils.storage import storage
 
 
@@ -21,7 +21,11 @@ class GameDetailsScreen(MDScreen):
         self.favorite_btn = None
         
     def load_game_details(self, game_id):
+        # A previous game may still be loading
+        async_api.cancel(self)
+        detail_prefetcher.record_open(game_id)
         self.game_id = game_id
+        self.game_data = None
         self.clear_widgets()
         
         layout = MDBoxLayout(orientation='vertical')
@@ -53,11 +57,21 @@ class GameDetailsScreen(MDScreen):
         layout.add_widget(scroll)
         self.add_widget(layout)
         
-        Clock.schedule_once(lambda dt: self.fetch_details(content), 0.1)
+        self.fetch_details(content)
+    
+    def on_leave(self, *args):
+        async_api.cancel(self)
     
     def fetch_details(self, content):
+        async_api.get_game_details(
+            self.game_id,
+            on_result=lambda game: self.show_details(content, game),
+            on_error=lambda e: self.show_error(content, e),
+            owner=self
+        )
+    
+    def show_details(self, content, game):
         try:
-            game = api.get_game_details(self.game_id)
             if game:
                 self.game_data = game
                 
@@ -71,7 +85,7 @@ class GameDetailsScreen(MDScreen):
                 content.clear_widgets()
                 
                 if game.get('background_image'):
-                    img = AsyncImage(source=game['background_image'], size_hint_y=None, height=dp(220))
+                    img = CachedImage(label='details', url=game['background_image'], size_hint_y=None, height=dp(220))
                     content.add_widget(img)
                 
                 info_card = MDCard(orientation='vertical', size_hint_y=None, padding=dp(15), spacing=dp(8), elevation=2, radius=[10, 10, 10, 10])
@@ -139,13 +153,16 @@ class GameDetailsScreen(MDScreen):
                     content.add_widget(desc_card)
                 
         except Exception as e:
-            content.clear_widgets()
-            error = MDLabel(text=f"Error: {e}", halign="center", size_hint_y=None, height=dp(50))
-            content.add_widget(error)
+            self.show_error(content, e)
+    
+    def show_error(self, content, e):
+        content.clear_widgets()
+        error = MDLabel(text=f"Error: {e}", halign="center", size_hint_y=None, height=dp(50))
+        content.add_widget(error)
     
     def go_back(self):
         app = MDApp.get_running_app()
-        app.sm.current = 'home'
+        app.switch_screen('home')
 
     
     def toggle_favorite(self):
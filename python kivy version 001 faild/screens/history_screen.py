@@ -1,20 +1,26 @@
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
-from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
-from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.gridlayout import MDGridLayout
 from kivymd.uix.button import MDIconButton, MDButton, MDButtonText
 from kivymd.uix.appbar import MDTopAppBar
-from kivy.uix.image import AsyncImage
 from kivy.metrics import dp
+from components.game_list import GameList
 from utils.storage import storage
 
 
 class HistoryScreen(MDScreen):
+    PAGE_SIZE = 20
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.loaded_count = 0
+        self.games_list = None
+        self.load_more_btn = None
+
+    def on_enter(self):
+        # Built here rather than in __init__: history changes while other
+        # screens are open, so it is rebuilt on every visit
         self.build_ui()
     
     def build_ui(self):
@@ -29,9 +35,8 @@ class HistoryScreen(MDScreen):
         toolbar.add_widget(back_btn)
         layout.add_widget(toolbar)
         
-        history = storage.get_history()
-        
-        if not history:
+        self.loaded_count = 0
+        if not storage.history_count():
             empty_box = MDBoxLayout(orientation='vertical', padding=dp(40), spacing=dp(20))
             empty_box.add_widget(MDBoxLayout())
             icon = MDIconButton(icon="history")
@@ -45,53 +50,39 @@ class HistoryScreen(MDScreen):
             empty_box.add_widget(MDBoxLayout())
             layout.add_widget(empty_box)
         else:
-            scroll = MDScrollView()
-            grid = MDGridLayout(cols=1, spacing=dp(10), size_hint_y=None, padding=dp(10))
-            grid.bind(minimum_height=grid.setter('height'))
-            
-            for game in reversed(history):
-                card = self.create_game_card(game)
-                grid.add_widget(card)
-            
-            scroll.add_widget(grid)
-            layout.add_widget(scroll)
+            self.games_list = GameList(
+                image_label='history',
+                card_height=dp(140),
+                image_key='image',
+                name_length=30,
+                action_text="View Again",
+                subtitle_func=self.views_text,
+                on_game_select=lambda lst, game: self.show_game_details(game['id'])
+            )
+            layout.add_widget(self.games_list)
+
+            self.load_more_btn = MDButton(style="text", size_hint_y=None, height=dp(40), on_release=lambda x: self.load_more())
+            self.load_more_btn.add_widget(MDButtonText(text="Load more"))
+            layout.add_widget(self.load_more_btn)
+            self.load_more()
         
         self.add_widget(layout)
     
-    def create_game_card(self, game):
-        card = MDCard(
-            orientation='horizontal',
-            size_hint_y=None,
-            height=dp(120),
-            padding=dp(8),
-            spacing=dp(10),
-            elevation=2,
-            radius=[10, 10, 10, 10]
-        )
-        
-        if game.get('image'):
-            img = AsyncImage(source=game['image'], size_hint_x=0.3)
-            card.add_widget(img)
-        
-        info_layout = MDBoxLayout(orientation='vertical', size_hint_x=0.7, spacing=dp(5))
-        name = MDLabel(text=game.get('name', 'Unknown')[:30], font_size="15sp", bold=True, size_hint_y=None, height=dp(30))
-        
-        # Rating with icon
-        rating_box = MDBoxLayout(orientation='horizontal', spacing=dp(3), size_hint_y=None, height=dp(20))
-        star_icon = MDIconButton(icon="star", disabled=True, size_hint=(None, None), size=(dp(14), dp(14)))
-        rating_label = MDLabel(text=f"{game.get('rating', 'N/A')}/5", font_size="12sp", size_hint_y=None, height=dp(20))
-        rating_box.add_widget(star_icon)
-        rating_box.add_widget(rating_label)
-        
-        btn = MDButton(style="text", size_hint_y=None, height=dp(40), on_release=lambda x: self.show_game_details(game['id']))
-        btn.add_widget(MDButtonText(text="View Again"))
-        
-        info_layout.add_widget(name)
-        info_layout.add_widget(rating_box)
-        info_layout.add_widget(btn)
-        card.add_widget(info_layout)
-        
-        return card
+    def load_more(self):
+        """Append the next page of history, most recent first"""
+        page = storage.get_history_page(self.loaded_count, self.PAGE_SIZE)
+        self.games_list.add_games(page)
+        self.loaded_count += len(page)
+
+        has_more = self.loaded_count < storage.history_count()
+        self.load_more_btn.opacity = 1 if has_more else 0
+        self.load_more_btn.disabled = not has_more
+        self.load_more_btn.height = dp(40) if has_more else 0
+
+    @staticmethod
+    def views_text(game):
+        views = game.get('view_count', 1)
+        return f"Viewed {views} time{'s' if views != 1 else ''}"
     
     def show_game_details(self, game_id):
         app = MDApp.get_running_app()
@@ -209,8 +209,7 @@ class LoginScreen(MDScreen):
         app.switch_screen('home')
         
         # Refresh profile screen
-        profile_screen = app.sm.get_screen('profile')
-        profile_screen.refresh_ui()
+        app.refresh_screen('profile')
     
     def login_as_guest(self, instance):
         # Save guest data
@@ -226,5 +225,4 @@ class LoginScreen(MDScreen):
         app.switch_screen('home')
         
         # Refresh profile screen
-        profile_screen = app.sm.get_screen('profile')
-        profile_screen.refresh_ui()
+        app.refresh_screen('profile')
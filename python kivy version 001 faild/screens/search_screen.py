@@ -1,21 +1,31 @@
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
-from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
-from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.gridlayout import MDGridLayout
-from kivymd.uix.button import MDButton, MDButtonText, MDIconButton
+from kivymd.uix.button import MDButton, MDButtonText
 from kivymd.uix.textfield import MDTextField
 from kivymd.uix.appbar import MDTopAppBar
-from kivy.uix.image import AsyncImage
+from kivy.clock import Clock
 from kivy.metrics import dp
+from config import SEARCH_DEBOUNCE, SEARCH_MIN_CHARS, SEARCH_INDEX_MIN_RESULTS
+from components.game_list import GameList
 from utils.api_helper import api
+from utils.async_api import async_api
+from utils.cache_manager import cache
+from utils.pagination import PagedResults
+from utils.search_index import search_index
+from utils.type_ahead import TypeAhead
 
 
 class SearchScreen(MDScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.current_query = None
+        self.local_only = False
+        self.index_backfilled = False
+        self.type_ahead = TypeAhead()
+        # Re-armed on every keystroke; fires once typing pauses
+        self.search_trigger = Clock.create_trigger(self.on_debounced_search, SEARCH_DEBOUNCE)
         self.build_ui()
     
     def build_ui(self):
@@ -33,6 +43,7 @@ class SearchScreen(MDScreen):
         
         self.search_field = MDTextField(mode="outlined", size_hint_x=0.75)
         self.search_field.hint_text = "Search for games..."
+        self.search_field.bind(text=self.on_search_text, on_text_validate=self.on_search_click)
         search_row.add_widget(self.search_field)
         
         # Search button
@@ -42,103 +53,124 @@ class SearchScreen(MDScreen):
         
         content.add_widget(search_row)
         
-        # Results area
-        scroll = MDScrollView()
-        self.results_grid = MDGridLayout(cols=1, spacing=dp(10), size_hint_y=None, padding=dp(5))
-        self.results_grid.bind(minimum_height=self.results_grid.setter('height'))
+        # Status line for prompts, progress and errors
+        self.status_label = MDLabel(halign="center", font_size="14sp", size_hint_y=None)
+        content.add_widget(self.status_label)
+        self.show_message("Start typing a game name")
         
-        # Initial message
-        self.initial_message = MDLabel(
-            text="Enter a game name and click Search",
-            halign="center",
-            font_size="14sp",
-            size_hint_y=None,
-            height=dp(100)
+        # Results area
+        self.results_list = GameList(
+            image_label='search',
+            card_height=dp(120),
+            name_length=35,
+            action_text="Details",
+            on_game_select=lambda lst, game: self.show_game_details(game['id'])
         )
-        self.results_grid.add_widget(self.initial_message)
-        
-        scroll.add_widget(self.results_grid)
-        content.add_widget(scroll)
+        content.add_widget(self.results_list)
+        
+        self.pager = PagedResults(
+            self.results_list,
+            endpoint='search',
+            owner=self,
+            on_page=self.on_search_results,
+            on_error=self.on_search_error
+        )
+        self.results_list.pager = self.pager
         
         layout.add_widget(content)
         self.add_widget(layout)
     
+    def on_search_text(self, instance, text):
+        """Search as the user types, once they pause"""
+        self.type_ahead.record('keystrokes')
+        self.search_trigger.cancel()
+        self.search_trigger()
+    
+    def on_debounced_search(self, dt):
+        query = self.search_field.text.strip()
+        if len(query) >= SEARCH_MIN_CHARS:
+            self.search_games(query)
+        else:
+            self.current_query = None
+            self.local_only = False
+            self.pager.reset()
+            self.results_list.clear_games()
+            self.show_message("Start typing a game name")
+    
     def on_search_click(self, instance):
         """Search when button is clicked"""
+        self.search_trigger.cancel()
         query = self.search_field.text.strip()
-        if len(query) >= 2:
-            self.search_games(query)
+        if len(query) >= SEARCH_MIN_CHARS:
+            self.search_games(query, remote=True)
         else:
-            self.results_grid.clear_widgets()
-            error_msg = MDLabel(
-                text="Please enter at least 2 characters",
-                halign="center",
-                theme_text_color="Error",
-                size_hint_y=None,
-                height=dp(50)
-            )
-            self.results_grid.add_widget(error_msg)
+            self.current_query = None
+            self.local_only = False
+            self.pager.reset()
+            self.results_list.clear_games()
+            self.show_message(f"Please enter at least {SEARCH_MIN_CHARS} characters", error=True)
     
-    def search_games(self, query):
-        self.results_grid.clear_widgets()
-        
-        # Show loading
-        loading = MDLabel(text="Searching...", halign="center", size_hint_y=None, height=dp(50))
-        self.results_grid.add_widget(loading)
-        
-        try:
-            data = api.search_games(query, page_size=15)
-            if data:
-                self.results_grid.clear_widgets()
-                games = data.get('results', [])
-                if games:
-                    for game in games:
-                        self.add_game_card(game)
-                else:
-                    self.results_grid.add_widget(MDLabel(text="No games found", halign="center", size_hint_y=None, height=dp(50)))
-            else:
-                self.results_grid.clear_widgets()
-                self.results_grid.add_widget(MDLabel(text="Error loading results", halign="center", theme_text_color="Error", size_hint_y=None, height=dp(50)))
-        except Exception as e:
-            self.results_grid.clear_widgets()
-            error = MDLabel(text=f"Error: {e}", halign="center", theme_text_color="Error", size_hint_y=None, height=dp(50))
-            self.results_grid.add_widget(error)
-            print(f"Error: {e}")
+    def show_message(self, text, error=False):
+        """Show a status line above the results; empty text hides it"""
+        self.status_label.text = text
+        self.status_label.theme_text_color = "Error" if error else "Primary"
+        self.status_label.height = dp(50) if text else 0
     
-    def add_game_card(self, game):
-        card = MDCard(
-            orientation='horizontal',
-            size_hint_y=None,
-            height=dp(120),
-            padding=dp(8),
-            spacing=dp(10),
-            elevation=2,
-            radius=[10, 10, 10, 10]
-        )
-        
-        if game.get('background_image'):
-            img = AsyncImage(source=game['background_image'], size_hint_x=0.3)
-            card.add_widget(img)
-        
-        info_layout = MDBoxLayout(orientation='vertical', size_hint_x=0.7, spacing=dp(5))
-        name = MDLabel(text=game.get('name', 'Unknown')[:35], font_size="15sp", bold=True, size_hint_y=None, height=dp(30))
-        
-        # Rating with icon
-        rating_box = MDBoxLayout(orientation='horizontal', spacing=dp(3), size_hint_y=None, height=dp(20))
-        star_icon = MDIconButton(icon="star", disabled=True, size_hint=(None, None), size=(dp(14), dp(14)))
-        rating_label = MDLabel(text=f"{game.get('rating', 'N/A')}/5", font_size="12sp", size_hint_y=None, height=dp(20))
-        rating_box.add_widget(star_icon)
-        rating_box.add_widget(rating_label)
-        
-        btn = MDButton(style="text", size_hint_y=None, height=dp(40), on_release=lambda x: self.show_game_details(game['id']))
-        btn.add_widget(MDButtonText(text="Details"))
-        
-        info_layout.add_widget(name)
-        info_layout.add_widget(rating_box)
-        info_layout.add_widget(btn)
-        card.add_widget(info_layout)
-        
-        self.results_grid.add_widget(card)
+    def on_enter(self, *args):
+        # Index responses cached before the search index existed
+        if not self.index_backfilled:
+            self.index_backfilled = True
+            async_api.submit(search_index.backfill, cache)
+    
+    def on_leave(self, *args):
+        self.search_trigger.cancel()
+        async_api.cancel(self)
+        print(f"Search stats: {self.type_ahead.get_stats()}")
+    
+    def search_games(self, query, remote=False):
+        """Show offline matches at once, then ask RAWG unless they are enough (remote forces it)"""
+        if query == self.current_query and not remote and (self.pager.has_pages or self.pager.loading or self.local_only):
+            self.type_ahead.record('skipped')
+            return
+        if self.pager.loading:
+            self.type_ahead.record('superseded')
+        self.current_query = query
+        
+        # Games seen before, or matches from a related earlier query,
+        # are shown until the real results arrive
+        indexed = search_index.search(query, limit=15)
+        local = indexed or self.type_ahead.local_results(query)
+        if local:
+            self.results_list.set_games(local)
+            self.show_message("")
+        else:
+            self.show_message("Searching...")
+        
+        if not remote and len(indexed) >= SEARCH_INDEX_MIN_RESULTS:
+            self.pager.reset()
+            self.local_only = True
+            self.type_ahead.record('index_hits')
+            return
+        
+        # Starting over cancels a search that is still running
+        self.local_only = False
+        self.type_ahead.record('requests')
+        self.pager.start(first_page=lambda: api.search_games(query, page_size=15))
+    
+    def on_search_results(self, page, games):
+        if page == 1:
+            self.type_ahead.remember(self.current_query, games)
+            self.show_message("" if games else "No games found")
+    
+    def on_search_error(self, e):
+        print(f"Error: {e}")
+        if self.pager.has_pages:
+            return
+        if self.results_list.data:
+            # Offline: keep the matches found locally
+            self.show_message("Offline - showing saved results")
+        else:
+            self.show_message(f"Error: {e}" if e else "Error loading results", error=True)
     
     def show_game_details(self, game_id):
         app = MDApp.get_running_app()
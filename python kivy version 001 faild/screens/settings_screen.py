@@ -8,6 +8,7 @@ from kivymd.uix.appbar import MDTopAppBar
 from kivymd.uix.dialog import MDDialog, MDDialogHeadlineText, MDDialogContentContainer, MDDialogButtonContainer
 from kivy.metrics import dp
 from utils.cache_manager import cache
+from utils.image_cache import image_cache
 from utils.storage import storage
 
 
@@ -171,10 +172,15 @@ class SettingsScreen(MDScreen):
         """Show cache information dialog"""
         cache_info = cache.get_cache_info()
         
-        dialog_content = MDBoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None, height=dp(150))
+        dialog_content = MDBoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None, height=dp(220))
         dialog_content.add_widget(MDLabel(text=f"Cached Items: {cache_info['count']}", size_hint_y=None, height=dp(30)))
         dialog_content.add_widget(MDLabel(text=f"Cache Size: {cache_info['size_mb']} MB", size_hint_y=None, height=dp(30)))
         dialog_content.add_widget(MDLabel(text=f"Expired Items: {cache_info['expired']}", size_hint_y=None, height=dp(30)))
+        dialog_content.add_widget(MDLabel(text=f"Image Cache: {image_cache.get_size()} MB", size_hint_y=None, height=dp(30)))
+        dialog_content.add_widget(MDLabel(
+            text=f"Saved This Session: {cache_info['bytes_saved'] // 1024} KB ({cache_info['revalidations']} unchanged)",
+            size_hint_y=None, height=dp(30)
+        ))
         dialog_content.add_widget(MDLabel(text="Cache expires after 2 days", font_size="12sp", size_hint_y=None, height=dp(30)))
         
         self.cache_dialog = MDDialog(
@@ -207,6 +213,7 @@ class SettingsScreen(MDScreen):
     def clear_cache(self, instance):
         """Clear all cache"""
         cleared = cache.clear_all()
+        image_cache.clear()
         
         dialog = MDDialog(
             MDDialogHeadlineText(text="Cache Cleared"),
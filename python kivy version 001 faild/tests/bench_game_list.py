@@ -0,0 +1,148 @@
+"""Benchmark: cards built eagerly in a GridLayout versus a recycled RecycleView.
+
+For 20, 200 and 2000 games it reports the widget count, build plus first
+layout time, memory allocated while building (tracemalloc, which also
+inflates the times) and the mean frame time while scrolling top to
+bottom. The cards are plain-Kivy stand-ins with the same widget tree as
+components/game_list.GameRow (image, title, rating row with an icon
+button, action button), so the benchmark runs without KivyMD.
+
+Not collected by pytest. Needs a window; headless, use SDL's offscreen
+driver:
+
+    SDL_VIDEODRIVER=offscreen python tests/bench_game_list.py [counts...]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+from kivy.base import EventLoop
+from kivy.core.window import Window
+from kivy.metrics import dp
+from kivy.properties import StringProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.image import Image
+from kivy.uix.label import Label
+from kivy.uix.recyclegridlayout import RecycleGridLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.scrollview import ScrollView
+
+CARD_HEIGHT = dp(120)
+
+
+def build_card(card, title, rating):
+    """Widget tree of one game card; returns the labels a recycled card rebinds"""
+    card.add_widget(Image(size_hint_x=0.3))
+    info = BoxLayout(orientation='vertical', size_hint_x=0.7)
+    name_label = Label(text=title)
+    info.add_widget(name_label)
+    rating_box = BoxLayout()
+    rating_box.add_widget(Button(text='*', size_hint=(None, None), size=(dp(14), dp(14))))
+    rating_label = Label(text=rating)
+    rating_box.add_widget(rating_label)
+    info.add_widget(rating_box)
+    info.add_widget(Button(text='View Details'))
+    card.add_widget(info)
+    return name_label, rating_label
+
+
+class EagerCard(BoxLayout):
+    """One card per game, as the screens built them before GameList"""
+
+    def __init__(self, title, rating, **kwargs):
+        super().__init__(size_hint_y=None, height=CARD_HEIGHT, **kwargs)
+        build_card(self, title, rating)
+
+
+class RecycledCard(RecycleDataViewBehavior, BoxLayout):
+    """Card built once and rebound to whichever game scrolls into view"""
+
+    title = StringProperty()
+    rating = StringProperty()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.name_label, self.rating_label = build_card(self, '', '')
+
+    def refresh_view_attrs(self, rv, index, data):
+        super().refresh_view_attrs(rv, index, data)
+        self.name_label.text = self.title
+        self.rating_label.text = self.rating
+
+
+def games(count):
+    return [{'title': f"Game {i}", 'rating': '4.5/5'} for i in range(count)]
+
+
+def eager_list(count):
+    scroll = ScrollView()
+    grid = GridLayout(cols=1, spacing=dp(10), size_hint_y=None)
+    grid.bind(minimum_height=grid.setter('height'))
+    scroll.add_widget(grid)
+    Window.add_widget(scroll)
+    for game in games(count):
+        grid.add_widget(EagerCard(game['title'], game['rating']))
+    return scroll
+
+
+def recycled_list(count):
+    view = RecycleView()
+    layout = RecycleGridLayout(cols=1, spacing=dp(10), default_size=(None, CARD_HEIGHT),
+                               default_size_hint=(1, None), size_hint_y=None)
+    layout.bind(minimum_height=layout.setter('height'))
+    view.add_widget(layout)
+    view.viewclass = RecycledCard
+    Window.add_widget(view)
+    view.data = games(count)
+    return view
+
+
+def widget_count(widget):
+    return 1 + sum(widget_count(child) for child in widget.children)
+
+
+def settle(frames=5):
+    for _ in range(frames):
+        EventLoop.idle()
+
+
+def scroll_frame_ms(scroller, steps=60):
+    started = time.perf_counter()
+    for step in range(steps):
+        scroller.scroll_y = 1 - step / steps
+        EventLoop.idle()
+    return (time.perf_counter() - started) / steps * 1000
+
+
+def main(counts=(20, 200, 2000)):
+    Window.size = (400, 800)
+    EventLoop.ensure_window()
+    print(f"{'items':>6}  {'mode':<8}{'widgets':>8}{'build+layout':>14}{'memory':>10}{'scroll frame':>14}")
+    for count in counts:
+        for mode, build in (('eager', eager_list), ('recycle', recycled_list)):
+            gc.collect()
+            tracemalloc.start()
+            started = time.perf_counter()
+            scroller = build(count)
+            settle()
+            build_ms = (time.perf_counter() - started) * 1000
+            memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            frame_ms = scroll_frame_ms(scroller)
+            print(f"{count:>6}  {mode:<8}{widget_count(scroller):>8}{build_ms:>11.0f} ms"
+                  f"{memory / 1e6:>7.1f} MB{frame_ms:>11.1f} ms")
+            Window.remove_widget(scroller)
+            del scroller
+            gc.collect()
+
+
+if __name__ == '__main__':
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (20, 200, 2000))
@@ -0,0 +1,78 @@
+"""Benchmark: per-call requests.get versus APIHelper's pooled keep-alive session.
+
+Runs against a local HTTP/1.1 stand-in server over loopback (no TLS, so
+the real gain against api.rawg.io, where each cold call also pays a TLS
+handshake, is larger). Not collected by pytest; run it directly:
+
+    python tests/bench_http_pool.py [requests]
+"""
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Keep the app's global cache out of the real home directory
+os.environ['HOME'] = tempfile.mkdtemp(prefix='gua-bench-')
+atexit.register(shutil.rmtree, os.environ['HOME'], True)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+
+from utils.api_helper import APIHelper
+
+BODY = json.dumps({'count': 0, 'results': []}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small JSON body and keeps the connection open"""
+
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one segment; split writes on a kept-alive
+    # connection stall on delayed ACKs and would make the pool look slow
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def requests_per_second(get, url, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        get(url).raise_for_status()
+    return count / (time.perf_counter() - started)
+
+
+def main(count=500):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/games"
+    helper = APIHelper()
+    try:
+        cold = requests_per_second(lambda u: requests.get(u, params={'page': 1}, timeout=5), url, count)
+        pooled = requests_per_second(
+            lambda u: helper.session.get(u, params={'page': 1}, timeout=helper.timeout), url, count
+        )
+    finally:
+        helper.close()
+        server.shutdown()
+    print(f"{count} sequential GETs over loopback")
+    print(f"  cold (requests.get):  {cold:7.0f} req/s")
+    print(f"  pooled (APIHelper):   {pooled:7.0f} req/s  ({pooled / cold:.2f}x)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,92 @@
+"""Benchmark: SearchIndex size and query latency at 10k and 100k games.
+
+Games are synthetic: a 1-4 word name, 2 genres, 3 platforms and a 20-80
+word description, added in 40-game batches as API pages would be. Each
+run times 204 prefix queries through search(). Two vocabularies:
+'realistic' (40k distinct words) and 'dense' (200 syllable words, so
+short prefixes match many names, the worst case for ranking).
+
+Not collected by pytest; run it directly (100k games takes about a
+minute to build per vocabulary):
+
+    python tests/bench_search_index.py [--dense] [counts...]
+"""
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.search_index import SearchIndex
+
+GENRES = ['Action', 'Indie', 'Adventure', 'RPG', 'Strategy', 'Shooter', 'Casual', 'Simulation',
+          'Puzzle', 'Arcade', 'Platformer', 'Racing']
+PLATFORMS = ['PC', 'PlayStation 5', 'PlayStation 4', 'Xbox One', 'Xbox Series S/X',
+             'Nintendo Switch', 'iOS', 'Android', 'macOS', 'Linux']
+SYLLABLES = ['ka', 'zel', 'da', 'wit', 'cher', 'por', 'tal', 'hal', 'life', 'dra', 'gon', 'star', 'war',
+             'dark', 'soul', 'fi', 'nal', 'fan', 'ta', 'sy', 'mar', 'io', 'ret', 'ro', 'cy', 'ber', 'punk',
+             'ne', 'on']
+
+
+def vocabulary(rng, dense):
+    if dense:
+        return [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(200)]
+    return [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(40000)]
+
+
+def make_game(rng, words, game_id):
+    return {
+        'id': game_id,
+        'name': ' '.join(rng.choice(words).capitalize() for _ in range(rng.randint(1, 4))),
+        'background_image': f"https://media.rawg.io/media/games/{game_id}.jpg",
+        'rating': round(rng.uniform(0, 5), 2),
+        'released': '2020-01-01',
+        'genres': [{'name': name} for name in rng.sample(GENRES, 2)],
+        'platforms': [{'platform': {'name': name}} for name in rng.sample(PLATFORMS, 3)],
+        'description_raw': ' '.join(rng.choice(words) for _ in range(rng.randint(20, 80))),
+    }
+
+
+def run(count, dense, directory):
+    rng = random.Random(7)
+    words = vocabulary(rng, dense)
+    games = [make_game(rng, words, game_id) for game_id in range(count)]
+    index = SearchIndex(Path(directory) / f"index_{count}_{'dense' if dense else 'real'}.db")
+    try:
+        started = time.perf_counter()
+        for start in range(0, count, 40):
+            index.add_games(games[start:start + 40])
+        build = time.perf_counter() - started
+        index._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+        queries = [game['name'].split()[0][:rng.randint(2, 6)] for game in rng.sample(games, 200)]
+        queries += ['zel da', 'dark soul', 'wit', 'action star']
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        print(f"{count:>7} games: {index.get_size():6.1f} MB, build {build:5.1f} s, "
+              f"p50 {statistics.median(latencies):5.2f} ms, p95 {latencies[int(len(latencies) * 0.95)]:5.2f} ms, "
+              f"max {latencies[-1]:6.2f} ms")
+    finally:
+        index.close()
+
+
+def main(args):
+    dense = '--dense' in args
+    counts = [int(arg) for arg in args if arg != '--dense'] or [10_000, 100_000]
+    print(f"{'dense' if dense else 'realistic'} vocabulary")
+    with tempfile.TemporaryDirectory(prefix='gua-bench-') as directory:
+        for count in counts:
+            run(count, dense, directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
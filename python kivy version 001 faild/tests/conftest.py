@@ -0,0 +1,12 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# The app keeps its cache and data under ~/.gua_app; point HOME at a
+# scratch directory before any app module creates its global instances.
+os.environ['HOME'] = tempfile.mkdtemp(prefix='gua-tests-')
+atexit.register(shutil.rmtree, os.environ['HOME'], True)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
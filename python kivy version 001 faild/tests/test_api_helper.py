@@ -0,0 +1,108 @@
+import time
+
+import requests
+
+from utils.api_helper import APIHelper
+from utils.circuit_breaker import CircuitBreaker
+
+
+class FakeSession:
+    """Session whose get() raises or returns the queued outcomes in turn"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def make_response(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{}'
+    return response
+
+
+class OkSession:
+    """Session that answers every request with an empty 200 and counts them"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls += 1
+        return make_response(200)
+
+
+def make_helper(outcomes):
+    helper = APIHelper(rate_limit=1000, rate_burst=1000, max_retries=0,
+                       breaker_threshold=1, breaker_reset=0)
+    helper._session = FakeSession(outcomes)
+    return helper
+
+
+def test_failed_trial_with_other_request_error_reopens_breaker():
+    helper = make_helper([
+        requests.ConnectionError('down'),
+        requests.exceptions.ChunkedEncodingError('truncated body'),
+        make_response(200),
+    ])
+
+    # Opens the breaker; with reset_timeout=0 it is half-open right away
+    assert helper._send('https://example.test/games', {}) is None
+    assert helper.breaker.state == CircuitBreaker.HALF_OPEN
+
+    # The trial call fails with an error that is neither ConnectionError nor Timeout
+    assert helper._send('https://example.test/games', {}) is None
+
+    # The next call is let through as a new trial and closes the breaker
+    response = helper._send('https://example.test/games', {})
+    assert response is not None and response.status_code == 200
+    assert helper.breaker.state == CircuitBreaker.CLOSED
+    assert helper.get_stats()['fast_failures'] == 0
+
+
+def test_unexpected_error_in_trial_releases_it():
+    helper = make_helper([
+        requests.ConnectionError('down'),
+        ValueError('bug'),
+        make_response(200),
+    ])
+    helper._send('https://example.test/games', {})
+
+    try:
+        helper._send('https://example.test/games', {})
+    except ValueError:
+        pass
+
+    response = helper._send('https://example.test/games', {})
+    assert response is not None and response.status_code == 200
+    assert helper.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_bulk_details_are_paced_only_by_the_shared_limiter():
+    helper = APIHelper(rate_limit=1000, rate_burst=1000)
+    helper._session = OkSession()
+
+    started = time.monotonic()
+    results = dict(helper.get_game_details_many(range(40), use_cache=False))
+    elapsed = time.monotonic() - started
+
+    assert len(results) == 40 and helper._session.calls == 40
+    # A second, slower bucket would hold 40 requests back for seconds
+    assert elapsed < 1.0
+
+
+def test_bulk_details_rate_is_an_extra_cap():
+    helper = APIHelper(rate_limit=1000, rate_burst=1000)
+    helper._session = OkSession()
+
+    started = time.monotonic()
+    list(helper.get_game_details_many(range(100, 112), use_cache=False, concurrency=2, rate=20))
+    # 2 requests from the burst, the other 10 at 20 per second
+    assert time.monotonic() - started >= 0.45
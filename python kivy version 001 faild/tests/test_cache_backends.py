@@ -0,0 +1,66 @@
+import sqlite3
+
+from utils.cache_backends import MANIFEST_FILE, FileCacheBackend, SQLiteCacheBackend, migrate_file_cache
+
+
+def entry(n):
+    return {'timestamp': '2026-01-01T00:00:00', 'expires': '2026-01-03T00:00:00',
+            'url': 'https://api.rawg.io/api/games', 'params': {'page': n}, 'data': {'n': n}}
+
+
+def file_cache(cache_dir, count):
+    backend = FileCacheBackend(cache_dir)
+    for n in range(count):
+        backend.write(f"k{n}", entry(n))
+    return backend
+
+
+def test_migration_imports_files_and_removes_manifest(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    file_cache(cache_dir, 3)
+    backend = SQLiteCacheBackend(cache_dir / 'cache.db')
+
+    assert migrate_file_cache(cache_dir, backend) == 3
+    assert list(cache_dir.glob('*.json')) == []
+    assert not (cache_dir / MANIFEST_FILE).exists()
+    assert backend.read('k2')[0]['data'] == {'n': 2}
+    backend.close()
+
+
+def test_failed_write_keeps_legacy_files(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    file_cache(cache_dir, 4)
+    backend = SQLiteCacheBackend(cache_dir / 'cache.db')
+    real_write = backend.write
+    writes = []
+
+    def write_until_disk_full(key, stored):
+        if writes:
+            raise sqlite3.OperationalError('database or disk is full')
+        writes.append(key)
+        return real_write(key, stored)
+
+    backend.write = write_until_disk_full
+    assert migrate_file_cache(cache_dir, backend) == 1
+    # Nothing that failed to import was deleted, and the manifest is kept
+    assert sorted(path.stem for path in cache_dir.glob('*.json')) == sorted({'k0', 'k1', 'k2', 'k3'} - set(writes))
+    assert (cache_dir / MANIFEST_FILE).exists()
+
+    # The next start retries and finishes
+    backend.write = real_write
+    assert migrate_file_cache(cache_dir, backend) == 3
+    assert backend.count() == 4
+    assert not (cache_dir / MANIFEST_FILE).exists()
+    backend.close()
+
+
+def test_corrupt_legacy_file_is_quarantined(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    file_cache(cache_dir, 1)
+    (cache_dir / 'broken.json').write_text('{"timestamp": ')
+    backend = SQLiteCacheBackend(cache_dir / 'cache.db')
+
+    assert migrate_file_cache(cache_dir, backend) == 1
+    assert [path.name.split('.')[0] for path in (cache_dir / 'quarantine').iterdir()] == ['broken']
+    assert backend.read('k0')[0]['data'] == {'n': 0}
+    backend.close()
@@ -0,0 +1,76 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from utils.cache_manager import CacheManager
+
+URL = 'https://api.rawg.io/api/games/1'
+
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    managers = []
+
+    def make(**kwargs):
+        manager = CacheManager(**kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.backend.close()
+
+
+def game(game_id):
+    """Game details with a long, very compressible description"""
+    return {'id': game_id, 'name': f"Game {game_id}", 'description_raw': 'An open world. ' * 400}
+
+
+@pytest.mark.parametrize('backend', ['file', 'sqlite'])
+def test_memory_tier_charges_decoded_size(make_cache, backend):
+    cache = make_cache(backend=backend, compression='zlib', compress_threshold=1024)
+    games = [game(game_id) for game_id in range(5)]
+    decoded = sum(len(json.dumps(data)) for data in games)
+
+    for data in games:
+        cache.set(URL, {'id': data['id']}, data)
+    stats = cache.get_stats()
+    assert stats['memory_entries'] == 5
+    assert stats['memory_bytes'] == decoded
+    # Far less is stored on disk than is held in memory
+    assert cache.backend.total_size() * 3 < decoded
+
+    # Entries promoted from disk are charged the same way
+    for read in (lambda data: cache.get(URL, {'id': data['id']}),
+                 lambda data: cache.get_many([(URL, {'id': data['id']})])):
+        cache.memory.clear()
+        for data in games:
+            read(data)
+        assert cache.get_stats()['memory_bytes'] == decoded
+
+
+def test_memory_tier_bound_applies_to_decoded_size(make_cache):
+    size = len(json.dumps(game(0)))
+    cache = make_cache(backend='sqlite', compression='zlib', compress_threshold=1024,
+                       memory_bytes=int(size * 2.5))
+    for game_id in range(5):
+        cache.set(URL, {'id': game_id}, game(game_id))
+    assert cache.get_stats()['memory_entries'] == 2
+
+
+@pytest.mark.parametrize('backend', ['file', 'sqlite'])
+def test_is_fresh_reads_only_the_expiry(make_cache, monkeypatch, backend):
+    cache = make_cache(backend=backend, compression='zlib', compress_threshold=1024)
+    cache.set(URL, {'id': 1}, game(1))
+    cache.set(URL, {'id': 2}, game(2), ttl=timedelta(seconds=-1))
+    cache.memory.clear()
+
+    def no_payload_reads(key):
+        raise AssertionError('is_fresh decoded a payload')
+
+    monkeypatch.setattr(cache.backend, 'read', no_payload_reads)
+    assert cache.is_fresh(URL, {'id': 1})
+    assert not cache.is_fresh(URL, {'id': 2})
+    assert not cache.is_fresh(URL, {'id': 3})
@@ -0,0 +1,32 @@
+import pytest
+
+from utils.eviction import GDSFPolicy, _HeapPolicy, create_policy
+
+
+def test_heap_policy_is_abstract():
+    with pytest.raises(TypeError):
+        _HeapPolicy()
+
+
+def test_gdsf_heap_rebuild_keeps_idle_entries_aged():
+    policy = create_policy('gdsf')
+    policy.on_insert('idle', 1)                 # priority 0 + 1/1
+    policy.on_insert('busy', 1)
+
+    # An eviction raises the inflation; then churn until the heap is rebuilt
+    policy._on_victim(5.0)
+    for _ in range(200):
+        policy.on_access('busy')
+    assert len(policy._heap) < 200, 'heap was not rebuilt'
+
+    # 'idle' keeps the priority from its last use and is still evicted first
+    assert policy._entries['idle']['priority'] == pytest.approx(1.0)
+    assert policy.victim() == 'idle'
+
+
+def test_gdsf_priority_uses_inflation_at_last_use():
+    policy = GDSFPolicy()
+    policy.on_insert('a', 2)
+    policy._on_victim(10.0)
+    policy.on_access('a')
+    assert policy._entries['a']['priority'] == pytest.approx(10.0 + 2 / 2)
@@ -0,0 +1,200 @@
+"""Fault injection for atomic_write and quarantine.
+
+Writers are killed at random offsets, or at random moments with SIGKILL,
+and the destination must always hold either the old or the new content.
+Files torn by other means are quarantined instead of being read.
+"""
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.cache_backends import FileCacheBackend
+from utils.compression import encode
+from utils.fileio import atomic_write, quarantine
+from utils.storage_backends import _read_json
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SEED = int(os.environ.get('GUA_FAULT_SEED', random.randrange(1 << 30)))
+
+
+def payload(tag, size):
+    """JSON document of roughly size bytes whose content identifies the writer"""
+    return json.dumps({'tag': tag, 'items': [tag] * (size // (len(tag) + 4))})
+
+
+def run_child(code, *args):
+    return subprocess.Popen(
+        [sys.executable, '-c', textwrap.dedent(code), *map(str, args)],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+
+
+# Child that writes `new` with atomic_write but dies after `offset` bytes
+# have reached the temporary file, as if the process were killed mid-write.
+CRASH_AT_OFFSET = """
+    import os, sys
+    from pathlib import Path
+    import utils.fileio as fileio
+
+    path, new, offset = Path(sys.argv[1]), Path(sys.argv[2]).read_bytes(), int(sys.argv[3])
+    real_open = open
+
+    class Dying:
+        def __init__(self, f):
+            self.f = f
+        def __enter__(self):
+            return self
+        def __exit__(self, *exc):
+            self.f.close()
+        def write(self, data):
+            self.f.write(data[:offset])
+            self.f.flush()
+            os._exit(9)
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+    fileio.open = lambda *a, **k: Dying(real_open(*a, **k))
+    fileio.atomic_write(path, new)
+    os._exit(0)
+"""
+
+# Child that keeps rewriting path with alternating documents until killed
+REWRITE_FOREVER = """
+    import sys
+    from pathlib import Path
+    from utils.fileio import atomic_write
+
+    path = Path(sys.argv[1])
+    docs = [Path(p).read_bytes() for p in sys.argv[2:]]
+    i = 0
+    while True:
+        atomic_write(path, docs[i % len(docs)])
+        i += 1
+"""
+
+
+@pytest.mark.parametrize('run', range(20))
+def test_write_killed_at_random_offset_leaves_old_content(tmp_path, run):
+    rng = random.Random(SEED + run)
+    path = tmp_path / 'favorites.json'
+    old = payload('old', rng.randrange(10, 5000)).encode()
+    new = payload('new', rng.randrange(10, 200_000)).encode()
+    atomic_write(path, old)
+    (tmp_path / 'new.bin').write_bytes(new)
+
+    offset = rng.randrange(0, len(new))
+    child = run_child(CRASH_AT_OFFSET, path, tmp_path / 'new.bin', offset)
+    _, err = child.communicate(timeout=30)
+    assert child.returncode == 9, f"seed {SEED}: {err.decode()}"
+
+    assert path.read_bytes() == old, f"seed {SEED}, offset {offset}"
+    assert _read_json(path, None, dict)['tag'] == 'old'
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGKILL'), reason='needs SIGKILL')
+@pytest.mark.parametrize('run', range(10))
+def test_sigkill_during_rewrites_leaves_old_or_new(tmp_path, run):
+    rng = random.Random(SEED + 100 + run)
+    path = tmp_path / 'history.json'
+    docs = {}
+    for tag in ('alpha', 'beta'):
+        docs[tag] = payload(tag, rng.randrange(100_000, 1_000_000)).encode()
+        (tmp_path / f"{tag}.bin").write_bytes(docs[tag])
+    atomic_write(path, docs['alpha'])
+
+    child = run_child(REWRITE_FOREVER, path, tmp_path / 'alpha.bin', tmp_path / 'beta.bin')
+    time.sleep(0.2 + rng.random() * 0.5)
+    child.send_signal(signal.SIGKILL)
+    child.wait(timeout=30)
+
+    assert path.read_bytes() in docs.values(), f"seed {SEED}"
+    # Leftover temporary files are never mistaken for the destination
+    assert _read_json(path, None, dict)['tag'] in docs
+
+
+def test_concurrent_readers_see_old_or_new(tmp_path):
+    path = tmp_path / 'user_data.json'
+    docs = [payload(tag, 300_000).encode() for tag in ('one', 'two', 'three')]
+    atomic_write(path, docs[0])
+    stop = threading.Event()
+    torn = []
+
+    def reader():
+        while not stop.is_set():
+            content = path.read_bytes()
+            if content not in docs:
+                torn.append(len(content))
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    try:
+        for i in range(60):
+            atomic_write(path, docs[i % len(docs)])
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+    assert torn == []
+
+
+@pytest.mark.parametrize('run', range(20))
+def test_truncated_json_is_quarantined(tmp_path, run):
+    rng = random.Random(SEED + 200 + run)
+    path = tmp_path / 'favorites.json'
+    content = payload('fav', rng.randrange(100, 20_000)).encode()
+    path.write_bytes(content)
+    os.truncate(path, rng.randrange(0, len(content)))
+
+    assert _read_json(path, {}, dict) == {}
+    assert not path.exists()
+    quarantined = list((tmp_path / 'quarantine').iterdir())
+    assert len(quarantined) == 1 and quarantined[0].name.startswith('favorites.json.')
+
+
+@pytest.mark.parametrize('codec', [None, 'zlib'])
+def test_truncated_cache_entry_is_quarantined(tmp_path, codec):
+    rng = random.Random(SEED + 300)
+    backend = FileCacheBackend(tmp_path / 'cache', codec=codec)
+    entry = {'timestamp': '2026-01-01T00:00:00', 'data': json.loads(payload('game', 50_000))}
+    backend.write('k1', entry)
+    cache_file = backend._get_cache_file('k1')
+    blob = cache_file.read_bytes()
+    assert blob == encode(json.dumps(entry).encode(), codec)
+
+    os.truncate(cache_file, rng.randrange(1, len(blob)))
+    assert backend.read('k1') is None
+    assert not cache_file.exists()
+    assert len(list((tmp_path / 'cache' / 'quarantine').iterdir())) == 1
+    # A second lookup is a plain miss, not another parse of the torn file
+    assert backend.read('k1') is None
+
+
+def test_quarantine_keeps_every_corrupt_copy(tmp_path):
+    path = tmp_path / 'history.json'
+    for _ in range(3):
+        path.write_text('{"broken')
+        quarantine(path, 'test')
+    assert not path.exists()
+    assert len(list((tmp_path / 'quarantine').iterdir())) == 3
+
+
+def test_non_durable_write_skips_fsync(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd))
+    path = tmp_path / 'thumb.jpg'
+    atomic_write(path, b'old')
+    assert len(synced) == 2              # the file and its directory
+    atomic_write(path, b'new', durable=False)
+    assert len(synced) == 2
+    assert path.read_bytes() == b'new'
+    assert [p.name for p in tmp_path.iterdir()] == ['thumb.jpg']
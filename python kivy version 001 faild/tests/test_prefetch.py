@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip('kivy')
+
+from utils import prefetch
+from utils.prefetch import DetailPrefetcher
+from utils.rate_limit import TokenBucket
+
+
+class FakeHelper:
+    """Stands in for APIHelper: nothing is cached and every fetch succeeds"""
+
+    def __init__(self, tokens):
+        self.limiter = TokenBucket(0.001, burst=tokens)
+        self.fetched = []
+
+    def has_game_details(self, game_id):
+        return False
+
+    def get_game_details(self, game_id):
+        self.limiter.acquire()
+        self.fetched.append(game_id)
+        return {'id': game_id}
+
+
+def run_batch(prefetcher, game_ids):
+    prefetcher.prefetch(object(), game_ids)
+    prefetcher.executor.shutdown(wait=True)
+    prefetcher._executor = None
+
+
+def test_metered_state_is_cached(monkeypatch):
+    checks = []
+    monkeypatch.setattr(prefetch, 'is_metered', lambda: checks.append(1) or True)
+    prefetcher = DetailPrefetcher(FakeHelper(10), metered_check=60)
+
+    for _ in range(5):
+        assert prefetcher.prefetch(object(), [1, 2, 3]) == 0
+    assert len(checks) == 1
+
+    prefetcher._metered_checked -= 60
+    prefetcher.prefetch(object(), [1])
+    assert len(checks) == 2
+
+
+def test_prefetch_leaves_reserve_tokens_to_foreground(monkeypatch):
+    monkeypatch.setattr(prefetch, 'is_metered', lambda: False)
+    helper = FakeHelper(tokens=8)
+    prefetcher = DetailPrefetcher(helper, count=6, workers=1, reserve_tokens=5.5)
+
+    run_batch(prefetcher, range(6))
+
+    # Only the tokens above the reserve are spent on prefetch
+    assert helper.fetched == [0, 1, 2]
+    assert prefetcher.get_stats()['busy'] == 3
+    assert helper.limiter.tokens > 5
@@ -0,0 +1,25 @@
+import pytest
+
+from utils.storage import UserStorage
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    return UserStorage(flush_delay=0, backend='json')
+
+
+def test_revisit_counts_views(storage):
+    storage.add_to_history(1, {'name': 'Portal'})
+    assert storage.get_history_entry(1)['view_count'] == 1
+    storage.add_to_history(1, {'name': 'Portal'})
+    assert storage.get_history_entry(1)['view_count'] == 2
+
+
+def test_revisit_of_legacy_entry_counts_its_first_view(storage):
+    storage._ensure_loaded()
+    # Saved before view counts existed; the history screen shows it as 1 view
+    storage._history['7'] = {'id': 7, 'name': 'Braid', 'viewed_at': 0}
+
+    storage.add_to_history(7, {'name': 'Braid'})
+    assert storage.get_history_entry(7)['view_count'] == 2
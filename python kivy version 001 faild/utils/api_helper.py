@@ -1,69 +1,414 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
 import requests
-from config import RAWG_API_KEY, API_BASE_URL
+from requests.adapters import HTTPAdapter
+from config import (
+    RAWG_API_KEY,
+    API_BASE_URL,
+    API_POOL_CONNECTIONS,
+    API_POOL_MAXSIZE,
+    API_POOL_BLOCK,
+    API_KEEP_ALIVE,
+    API_CONNECT_TIMEOUT,
+    API_READ_TIMEOUT,
+    CACHE_TTL_HOURS,
+    CACHE_STALE_GRACE_HOURS,
+    DETAILS_MANY_CONCURRENCY,
+    DETAILS_MANY_RATE,
+    API_RATE_LIMIT,
+    API_RATE_BURST,
+    API_MAX_RETRIES,
+    API_BACKOFF_BASE,
+    API_BACKOFF_MAX,
+    API_RETRY_AFTER_MAX,
+    API_BREAKER_THRESHOLD,
+    API_BREAKER_RESET,
+)
 from utils.cache_manager import cache
+from utils.circuit_breaker import CircuitBreaker
+from utils.rate_limit import TokenBucket
+from utils.search_index import search_index
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution"""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args):
+        """Run func(*args) unless a call for key is already running, then share its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = func(*args)
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+
+
+# Responses worth retrying: rate limited, or the server is having trouble
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
 
 
 class APIHelper:
-    """Helper for API calls with caching"""
-    
-    @staticmethod
-    def get_games(params=None, use_cache=True):
-        """Get games list with caching"""
-        url = f"{API_BASE_URL}/games"
-        
-        # Add API key to params
-        if params is None:
-            params = {}
-        params['key'] = RAWG_API_KEY
-        
+    """Helper for API calls with caching.
+
+    Every request takes a token from a shared bucket, transient failures
+    are retried with backoff (or after Retry-After), and a circuit breaker
+    stops calling RAWG while it is down. Requests that still fail are
+    answered with cached data of any age when there is some.
+    """
+
+    def __init__(self, pool_connections=API_POOL_CONNECTIONS, pool_maxsize=API_POOL_MAXSIZE,
+                 pool_block=API_POOL_BLOCK, keep_alive=API_KEEP_ALIVE,
+                 connect_timeout=API_CONNECT_TIMEOUT, read_timeout=API_READ_TIMEOUT,
+                 ttl_hours=CACHE_TTL_HOURS, stale_grace_hours=CACHE_STALE_GRACE_HOURS,
+                 rate_limit=API_RATE_LIMIT, rate_burst=API_RATE_BURST, max_retries=API_MAX_RETRIES,
+                 backoff_base=API_BACKOFF_BASE, backoff_max=API_BACKOFF_MAX,
+                 retry_after_max=API_RETRY_AFTER_MAX, breaker_threshold=API_BREAKER_THRESHOLD,
+                 breaker_reset=API_BREAKER_RESET):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, read_timeout)
+        self.ttls = {endpoint: timedelta(hours=hours) for endpoint, hours in ttl_hours.items()}
+        self.stale_grace = timedelta(hours=stale_grace_hours)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._refresh_executor = None
+        self._refreshing = set()
+        self._inflight = SingleFlight()
+        self.limiter = TokenBucket(rate_limit, rate_burst)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self._stats_lock = threading.Lock()
+        self._stats = {'retries': 0, 'rate_limited': 0, 'fast_failures': 0, 'fallbacks': 0}
+
+    @property
+    def session(self):
+        """Shared keep-alive session, created on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        """Build a session backed by a bounded connection pool"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def close(self):
+        """Close pooled connections and stop background refreshes"""
+        with self._session_lock:
+            if self._refresh_executor is not None:
+                self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+                self._refresh_executor = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _fetch(self, url, params, use_cache=True, label="data", endpoint=None):
+        """Return cached data for url+params or fetch and cache it.
+
+        Stale entries within the grace window are returned immediately and
+        refreshed in the background.
+        """
+        ttl = self.ttls.get(endpoint)
+
         # Try cache first
         if use_cache:
-            cached_data = cache.get(url, params)
-            if cached_data:
-                print(f"Using cached data for games")
+            cached = cache.get_entry(url, params, stale_grace=self.stale_grace, keep_expired=True)
+            if cached:
+                cached_data, is_stale = cached
+                if is_stale:
+                    print(f"Using stale cached {label}, refreshing")
+                    self._refresh_in_background(url, params, ttl)
+                else:
+                    print(f"Using cached {label}")
                 return cached_data
-        
-        # Fetch from API
+
+        return self._request_or_cached(url, params, ttl, label)
+
+    def _request_or_cached(self, url, params, ttl, label="data"):
+        """Fetch, falling back to cached data of any age if RAWG cannot answer"""
+        data = self._request(url, params, ttl)
+        if data is None:
+            data = cache.get_fallback(url, params)
+            if data is not None:
+                print(f"API unavailable, using old cached {label}")
+                self._count('fallbacks')
+        return data
+
+    def _request(self, url, params, ttl=None):
+        """Fetch from the API and cache the response.
+
+        Concurrent requests for the same cache key share one network call
+        and one cache write.
+        """
+        cache_key = cache._get_cache_key(url, params)
+        return self._inflight.do(cache_key, self._download, url, params, ttl)
+
+    def _download(self, url, params, ttl):
+        """Single logical request (retries included); caches a 200 response.
+
+        If an earlier response left an ETag or Last-Modified, the request is
+        conditional and a 304 only renews the cached entry.
+        """
         try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
+            validators = cache.get_validators(url, params)
+            response = self._send(url, params, headers=self._conditional_headers(validators))
+            if response is not None and response.status_code == 304:
+                data = cache.renew(url, params, ttl)
+                if data is not None:
+                    return data
+                # The entry went away in the meantime; ask for the full response
+                response = self._send(url, params)
+            if response is not None and response.status_code == 200:
                 data = response.json()
                 # Cache the response
-                cache.set(url, params, data)
+                cache.set(url, params, data, ttl, validators=self._validators(response))
+                self._index(data)
                 return data
             return None
         except Exception as e:
             print(f"API Error: {e}")
             return None
-    
+
+    @staticmethod
+    def _conditional_headers(validators):
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    @staticmethod
+    def _validators(response):
+        """ETag/Last-Modified of a response plus its body size, or None if it has neither"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return None
+        return {'etag': etag, 'last_modified': last_modified, 'bytes': len(response.content)}
+
+    def _send(self, url, params, headers=None):
+        """GET url through the rate limiter and circuit breaker, retrying transient failures.
+
+        Returns the response, or None if RAWG could not be reached or kept
+        failing.
+        """
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                self._count('fast_failures')
+                return None
+            self.limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                # Any transport error counts against the breaker, so a failed
+                # half-open trial reopens it instead of leaving it stuck
+                print(f"API Error: {e}")
+                response = None
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            if response is not None and response.status_code not in TRANSIENT_STATUSES:
+                # 200 and permanent errors such as 404 both show RAWG is up
+                self.breaker.record_success()
+                return response
+
+            self.breaker.record_failure()
+            if response is not None and response.status_code == 429:
+                self._count('rate_limited')
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                if retry_after > self.retry_after_max:
+                    # Quota exhausted; answer from the cache until it resets
+                    print(f"API rate limited for {retry_after:.0f} s")
+                    self.breaker.trip(retry_after)
+                    return None
+                self.limiter.hold(retry_after)
+            if attempt == self.max_retries:
+                break
+            self._count('retries')
+            if retry_after is None:
+                # Exponential backoff with full jitter
+                time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+        return None
+
     @staticmethod
-    def get_game_details(game_id, use_cache=True):
+    def _retry_after(response):
+        """Seconds from a Retry-After header (delta-seconds or HTTP date), or None"""
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _index(self, data):
+        """Add the games in a response to the offline search index"""
+        try:
+            search_index.add_payload(data)
+        except Exception as e:
+            print(f"Search index error: {e}")
+
+    def _refresh_in_background(self, url, params, ttl):
+        """Re-fetch a stale entry once, off the calling thread"""
+        cache_key = cache._get_cache_key(url, params)
+        with self._session_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='gua-refresh')
+            executor = self._refresh_executor
+
+        def refresh():
+            try:
+                self._request(url, dict(params), ttl)
+            finally:
+                with self._session_lock:
+                    self._refreshing.discard(cache_key)
+
+        executor.submit(refresh)
+
+    def get_stats(self):
+        """Get API call counters, rate limiter tokens and circuit breaker state"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            'coalesced_calls': self._inflight.coalesced,
+            'rate_tokens': round(self.limiter.tokens, 2),
+            'breaker_state': self.breaker.state,
+            'breaker_failures': self.breaker.failures,
+            'breaker_opens': self.breaker.opens,
+        })
+        return stats
+
+    def get_games(self, params=None, use_cache=True):
+        """Get games list with caching"""
+        url = f"{API_BASE_URL}/games"
+
+        # Add API key to params
+        if params is None:
+            params = {}
+        params['key'] = RAWG_API_KEY
+
+        return self._fetch(url, params, use_cache, label="data for games", endpoint='games')
+
+    def get_game_details(self, game_id, use_cache=True):
         """Get game details with caching"""
         url = f"{API_BASE_URL}/games/{game_id}"
         params = {'key': RAWG_API_KEY}
-        
-        # Try cache first
+
+        return self._fetch(url, params, use_cache, label=f"data for game {game_id}", endpoint='game_details')
+
+    def get_game_details_many(self, game_ids, use_cache=True,
+                              concurrency=DETAILS_MANY_CONCURRENCY, rate=DETAILS_MANY_RATE):
+        """Yield (game_id, data) for each distinct id as soon as it is available.
+
+        Cached details come first, looked up in a single pass. The rest are
+        fetched with at most `concurrency` requests in flight, paced by the
+        shared rate limiter; `rate` optionally caps them further (requests
+        per second, 0 for no extra cap). data is None for games that failed.
+        Closing the generator early cancels the fetches not yet started.
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        requests_for = {
+            game_id: (f"{API_BASE_URL}/games/{game_id}", {'key': RAWG_API_KEY}) for game_id in game_ids
+        }
+
+        missing = game_ids
         if use_cache:
-            cached_data = cache.get(url, params)
-            if cached_data:
-                print(f"Using cached data for game {game_id}")
-                return cached_data
-        
-        # Fetch from API
+            cached = cache.get_many([requests_for[game_id] for game_id in game_ids])
+            missing = []
+            for game_id, data in zip(game_ids, cached):
+                if data is None:
+                    missing.append(game_id)
+                else:
+                    yield game_id, data
+        if not missing:
+            return
+
+        # Every request already takes a token from self.limiter in _send
+        bucket = TokenBucket(rate, burst=concurrency) if rate else None
+        ttl = self.ttls.get('game_details')
+
+        def fetch(game_id):
+            if bucket is not None:
+                bucket.acquire()
+            url, params = requests_for[game_id]
+            return self._request_or_cached(url, params, ttl, label=f"data for game {game_id}")
+
+        executor = ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix='gua-details')
         try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                # Cache the response
-                cache.set(url, params, data)
-                return data
-            return None
-        except Exception as e:
-            print(f"API Error: {e}")
-            return None
-    
-    @staticmethod
-    def search_games(query, page_size=15, use_cache=True):
+            pending = {executor.submit(fetch, game_id): game_id for game_id in missing}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    game_id = pending.pop(future)
+                    yield game_id, future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def has_game_details(self, game_id):
+        """True if details for game_id are cached and fresh"""
+        return cache.is_fresh(f"{API_BASE_URL}/games/{game_id}", {'key': RAWG_API_KEY})
+
+    def search_games(self, query, page_size=15, use_cache=True):
         """Search games with caching"""
         url = f"{API_BASE_URL}/games"
         params = {
@@ -71,26 +416,22 @@ class APIHelper:
             'search': query,
             'page_size': page_size
         }
-        
-        # Try cache first
-        if use_cache:
-            cached_data = cache.get(url, params)
-            if cached_data:
-                print(f"Using cached search results for '{query}'")
-                return cached_data
-        
-        # Fetch from API
-        try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                # Cache the response
-                cache.set(url, params, data)
-                return data
-            return None
-        except Exception as e:
-            print(f"API Error: {e}")
-            return None
+
+        return self._fetch(url, params, use_cache, label=f"search results for '{query}'", endpoint='search')
+
+    def get_page(self, page_url, endpoint='games', use_cache=True):
+        """Follow the `next`/`previous` link of a paginated response with caching"""
+        parts = urlsplit(page_url)
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+        if not url.startswith(API_BASE_URL):
+            raise ValueError(f"Refusing to follow page link outside the API: {url}")
+
+        # The link may carry an older API key; cache keys ignore it and
+        # treat "2" and 2 alike, so the page matches a direct request
+        params = dict(parse_qsl(parts.query))
+        params['key'] = RAWG_API_KEY
+
+        return self._fetch(url, params, use_cache, label=f"page {params.get('page', 1)} of {endpoint}", endpoint=endpoint)
 
 
 # Global API helper instance
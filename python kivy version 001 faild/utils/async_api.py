@@ -0,0 +1,158 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+from config import API_WORKERS
+from utils.api_helper import api
+
+
+class AsyncRequest:
+    """Handle for an API call running on the worker pool"""
+
+    def __init__(self, owner=None):
+        self.owner = owner
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the request; its callbacks will never run"""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class AsyncAPIHelper:
+    """Runs APIHelper calls off the Kivy main thread.
+
+    Results are delivered back on the main thread through Clock callbacks.
+    Requests can be tagged with an owner (usually a screen) so everything it
+    started can be cancelled when the user navigates away.
+    """
+
+    def __init__(self, helper, max_workers=API_WORKERS):
+        self.helper = helper
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    @property
+    def executor(self):
+        """Worker pool, created on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='gua-api'
+                    )
+        return self._executor
+
+    def submit(self, func, *args, on_result=None, on_error=None, owner=None, **kwargs):
+        """Run func(*args, **kwargs) in the background and return an AsyncRequest"""
+        return self._start(AsyncRequest(owner), func, args, kwargs, on_result, on_error)
+
+    def _start(self, request, func, args, kwargs, on_result, on_error):
+        self._track(request)
+        request.future = self.executor.submit(func, *args, **kwargs)
+        request.future.add_done_callback(
+            lambda future: self._schedule_delivery(request, future, on_result, on_error)
+        )
+        return request
+
+    def _schedule_delivery(self, request, future, on_result, on_error):
+        """Hand a finished future back to the main thread"""
+        Clock.schedule_once(lambda dt: self._deliver(request, future, on_result, on_error), 0)
+
+    def _deliver(self, request, future, on_result, on_error):
+        """Invoke callbacks on the main thread unless the request was cancelled"""
+        self._untrack(request)
+        if request.cancelled or future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"API Error: {error}")
+            return
+
+        if on_result:
+            on_result(future.result())
+
+    def _track(self, request):
+        with self._lock:
+            self._pending.setdefault(id(request.owner), set()).add(request)
+
+    def _untrack(self, request):
+        with self._lock:
+            requests_for_owner = self._pending.get(id(request.owner))
+            if requests_for_owner is not None:
+                requests_for_owner.discard(request)
+                if not requests_for_owner:
+                    del self._pending[id(request.owner)]
+
+    def cancel(self, owner):
+        """Cancel every pending request started by owner"""
+        with self._lock:
+            requests_for_owner = self._pending.pop(id(owner), set())
+        for request in requests_for_owner:
+            request.cancel()
+        return len(requests_for_owner)
+
+    def get_games(self, params=None, use_cache=True, on_result=None, on_error=None, owner=None):
+        """Get games list in the background"""
+        return self.submit(self.helper.get_games, params, use_cache,
+                           on_result=on_result, on_error=on_error, owner=owner)
+
+    def get_game_details(self, game_id, use_cache=True, on_result=None, on_error=None, owner=None):
+        """Get game details in the background"""
+        return self.submit(self.helper.get_game_details, game_id, use_cache,
+                           on_result=on_result, on_error=on_error, owner=owner)
+
+    def get_game_details_many(self, game_ids, use_cache=True, on_item=None, on_result=None,
+                              on_error=None, owner=None):
+        """Get details for many games in the background.
+
+        on_item(game_id, data) runs on the main thread as each game arrives;
+        on_result gets {game_id: data} once all are done.
+        """
+        request = AsyncRequest(owner)
+
+        def fetch_all():
+            results = {}
+            for game_id, data in self.helper.get_game_details_many(game_ids, use_cache):
+                if request.cancelled:
+                    break
+                results[game_id] = data
+                if on_item:
+                    Clock.schedule_once(
+                        lambda dt, game_id=game_id, data=data: request.cancelled or on_item(game_id, data), 0
+                    )
+            return results
+
+        return self._start(request, fetch_all, (), {}, on_result, on_error)
+
+    def search_games(self, query, page_size=15, use_cache=True, on_result=None, on_error=None, owner=None):
+        """Search games in the background"""
+        return self.submit(self.helper.search_games, query, page_size, use_cache,
+                           on_result=on_result, on_error=on_error, owner=owner)
+
+    def shutdown(self):
+        """Cancel queued work and stop the worker pool"""
+        with self._lock:
+            pending = [r for requests_for_owner in self._pending.values() for r in requests_for_owner]
+            self._pending.clear()
+            executor, self._executor = self._executor, None
+        for request in pending:
+            request.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global async API helper instance
+async_api = AsyncAPIHelper(api)
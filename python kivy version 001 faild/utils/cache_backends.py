@@ -0,0 +1,468 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from utils import compression
+from utils.cache_manifest import CacheManifest
+from utils.fileio import atomic_write, quarantine
+
+# Journal of the file backend's entry sizes and expiry (see CacheManifest)
+MANIFEST_FILE = 'manifest.log'
+
+
+def entry_expiry(entry, default_duration):
+    """Return the datetime an entry expires at.
+
+    Entries written before per-entry expiry existed only carry a timestamp,
+    so they fall back to timestamp + default_duration.
+    """
+    if entry.get('expires'):
+        return datetime.fromisoformat(entry['expires'])
+    return datetime.fromisoformat(entry['timestamp']) + default_duration
+
+
+def read_entry_file(path):
+    """Return (entry, size) for a cache file, compressed or plain JSON.
+
+    Raises ValueError if the file is truncated or otherwise corrupt.
+    """
+    with open(path, 'rb') as f:
+        blob = f.read()
+    entry = json.loads(compression.decode(blob))
+    if not isinstance(entry, dict) or 'timestamp' not in entry or 'data' not in entry:
+        raise ValueError("Cache entry is missing required fields")
+    return entry, len(blob)
+
+
+class FileCacheBackend:
+    """One JSON file per cache key.
+
+    Counts, sizes and expiry are served from a CacheManifest kept next to
+    the files, so statistics never open or stat the entries themselves.
+    """
+
+    name = 'file'
+
+    def __init__(self, cache_dir, default_duration=timedelta(days=2), codec=None, compress_threshold=0):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.default_duration = default_duration
+        self.codec = codec
+        self.compress_threshold = compress_threshold
+        self.manifest = CacheManifest(cache_dir / MANIFEST_FILE)
+        # Temporary files left by writes that were interrupted
+        for tmp_file in self.cache_dir.glob('.*.tmp'):
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        if not self.manifest.load() or self.manifest.count != self._count_files():
+            self.repair()
+
+    def _get_cache_file(self, cache_key):
+        """Get cache file path"""
+        return self.cache_dir / f"{cache_key}.json"
+
+    def _count_files(self):
+        """Count entry files from the directory listing alone"""
+        with os.scandir(self.cache_dir) as it:
+            return sum(1 for item in it if item.name.endswith('.json'))
+
+    def read(self, key):
+        """Return (entry, size) for key, or None"""
+        cache_file = self._get_cache_file(key)
+        if not cache_file.exists():
+            return None
+        try:
+            return read_entry_file(cache_file)
+        except ValueError as e:
+            # Move it aside so it is not re-parsed on every lookup
+            quarantine(cache_file, e)
+            self.manifest.record_delete(key)
+            return None
+
+    def read_many(self, keys):
+        """Return {key: (entry, size)} for the keys that are stored"""
+        found = {}
+        for key in keys:
+            stored = self.read(key)
+            if stored is not None:
+                found[key] = stored
+        return found
+
+    def expiry(self, key):
+        """Return when key's entry expires, from the manifest alone, or None if not stored"""
+        manifest_entry = self.manifest.entries.get(key)
+        return datetime.fromtimestamp(manifest_entry[1]) if manifest_entry else None
+
+    def validators(self, key):
+        """Return the stored response validators for key, or None"""
+        stored = self.read(key)
+        return stored[0].get('validators') if stored else None
+
+    def requests(self):
+        """(key, url, params) of every stored entry"""
+        found = []
+        for key in self.keys():
+            stored = self.read(key)
+            if stored is not None:
+                found.append((key, stored[0].get('url'), stored[0].get('params')))
+        return found
+
+    def rekey(self, old_key, new_key, params):
+        """Move an entry to new_key with its stored params replaced; keeps the later-expiring of two"""
+        stored = self.read(old_key)
+        if stored is None:
+            return False
+        entry = stored[0]
+        entry['params'] = params
+        if new_key != old_key:
+            existing = self.read(new_key)
+            if existing is not None and (
+                entry_expiry(existing[0], self.default_duration) >= entry_expiry(entry, self.default_duration)
+            ):
+                self.delete(old_key)
+                return False
+        self.write(new_key, entry)
+        if new_key != old_key:
+            self.delete(old_key)
+        return True
+
+    def renew(self, key, timestamp, expires):
+        """Give an entry a new timestamp and expiry; returns (entry, size) or None if missing.
+
+        The file holds the whole entry, so it is rewritten with the same payload.
+        """
+        stored = self.read(key)
+        if stored is None:
+            return None
+        entry = stored[0]
+        entry['timestamp'] = timestamp.isoformat()
+        entry['expires'] = expires.isoformat()
+        return entry, self.write(key, entry)
+
+    def write(self, key, entry):
+        """Store an entry and return its size in bytes"""
+        payload = compression.encode(json.dumps(entry).encode(), self.codec, self.compress_threshold)
+        atomic_write(self._get_cache_file(key), payload)
+        expires = entry_expiry(entry, self.default_duration).timestamp()
+        self.manifest.record_set(key, len(payload), expires)
+        return len(payload)
+
+    def delete(self, key):
+        try:
+            os.remove(self._get_cache_file(key))
+            return True
+        except FileNotFoundError:
+            return False
+        finally:
+            self.manifest.record_delete(key)
+
+    def keys(self):
+        return list(self.manifest.entries)
+
+    def entries(self):
+        """(key, size) pairs, oldest write first"""
+        return [(key, size) for key, (size, _) in list(self.manifest.entries.items())]
+
+    def expired_keys(self, now):
+        """Keys whose entries expired before now"""
+        return self.manifest.expired_keys(now.timestamp())
+
+    def count(self):
+        return self.manifest.count
+
+    def count_expired(self, now):
+        return self.manifest.count_expired(now.timestamp())
+
+    def total_size(self):
+        """Total size of stored entries in bytes"""
+        return self.manifest.total_bytes
+
+    def clear(self):
+        cleared = 0
+        for cache_file in self.cache_dir.glob('*.json'):
+            try:
+                os.remove(cache_file)
+                cleared += 1
+            except Exception as e:
+                print(f"Error clearing cache: {e}")
+        self.manifest.record_clear()
+        return cleared
+
+    def repair(self):
+        """Rebuild the manifest from the files on disk"""
+        entries = []
+        for cache_file in self.cache_dir.glob('*.json'):
+            try:
+                entry, size = read_entry_file(cache_file)
+                expires = entry_expiry(entry, self.default_duration).timestamp()
+                entries.append((cache_file.stem, size, expires))
+            except ValueError as e:
+                quarantine(cache_file, e)
+            except OSError as e:
+                print(f"Error reading cache: {e}")
+        self.manifest.rebuild(entries)
+        return len(entries)
+
+    def close(self):
+        pass
+
+
+class SQLiteCacheBackend:
+    """All cache entries in a single SQLite database (WAL mode).
+
+    Expiry is stored as an indexed column so sweeps and statistics are
+    index lookups instead of parsing every entry.
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            params TEXT,
+            timestamp REAL NOT NULL,
+            expires REAL NOT NULL,
+            size INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            validators TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries (expires);
+    """
+
+    def __init__(self, db_path, default_duration=timedelta(days=2), codec=None, compress_threshold=0):
+        self.db_path = db_path
+        self.default_duration = default_duration
+        self.codec = codec
+        self.compress_threshold = compress_threshold
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(entries)')]
+        if 'validators' not in columns:
+            # Databases created before validators were stored
+            self._conn.execute('ALTER TABLE entries ADD COLUMN validators TEXT')
+        self._conn.commit()
+        self.repair()
+
+    # SQLite's default limit on host parameters in one statement is 999
+    READ_BATCH = 500
+
+    def read(self, key):
+        """Return (entry, size) for key, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT key, url, params, timestamp, expires, size, payload, validators FROM entries WHERE key = ?',
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self._decode(row)
+
+    def read_many(self, keys):
+        """Return {key: (entry, size)} for the keys that are stored, in one query per batch"""
+        keys = list(keys)
+        rows = []
+        with self._lock:
+            for start in range(0, len(keys), self.READ_BATCH):
+                batch = keys[start:start + self.READ_BATCH]
+                rows += self._conn.execute(
+                    'SELECT key, url, params, timestamp, expires, size, payload, validators FROM entries '
+                    f'WHERE key IN ({",".join("?" * len(batch))})',
+                    batch
+                ).fetchall()
+        found = {}
+        for row in rows:
+            stored = self._decode(row)
+            if stored is not None:
+                found[row[0]] = stored
+        return found
+
+    def _decode(self, row):
+        """(entry, size) from a table row; corrupt rows are dropped"""
+        key, url, params, timestamp, expires, size, payload, validators = row
+        try:
+            entry = {
+                'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+                'expires': datetime.fromtimestamp(expires).isoformat(),
+                'url': url,
+                'params': json.loads(params) if params else None,
+                # Rows written before compression support hold JSON text
+                'data': json.loads(payload if isinstance(payload, str) else compression.decode(payload)),
+                'validators': json.loads(validators) if validators else None
+            }
+        except ValueError as e:
+            print(f"Dropping corrupt cache row: {e}")
+            self.delete(key)
+            return None
+        return entry, size
+
+    def write(self, key, entry):
+        """Store an entry and return its size in bytes"""
+        payload = compression.encode(json.dumps(entry['data']).encode(), self.codec, self.compress_threshold)
+        timestamp = datetime.fromisoformat(entry['timestamp'])
+        expires = entry_expiry(entry, self.default_duration)
+        with self._lock, self._conn:
+            self._forget(key)
+            self._conn.execute(
+                'INSERT INTO entries (key, url, params, timestamp, expires, size, payload, validators) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, entry['url'], json.dumps(entry.get('params')), timestamp.timestamp(),
+                 expires.timestamp(), len(payload), payload,
+                 json.dumps(entry['validators']) if entry.get('validators') else None)
+            )
+            self._count += 1
+            self._total_size += len(payload)
+        return len(payload)
+
+    def expiry(self, key):
+        """Return when key's entry expires without reading its payload, or None if not stored"""
+        with self._lock:
+            row = self._conn.execute('SELECT expires FROM entries WHERE key = ?', (key,)).fetchone()
+        return datetime.fromtimestamp(row[0]) if row else None
+
+    def validators(self, key):
+        """Return the stored response validators for key, or None"""
+        with self._lock:
+            row = self._conn.execute('SELECT validators FROM entries WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def requests(self):
+        """(key, url, params) of every stored entry"""
+        with self._lock:
+            rows = self._conn.execute('SELECT key, url, params FROM entries').fetchall()
+        return [(key, url, json.loads(params) if params else None) for key, url, params in rows]
+
+    def rekey(self, old_key, new_key, params):
+        """Move an entry to new_key with its stored params replaced; keeps the later-expiring of two"""
+        with self._lock, self._conn:
+            if new_key != old_key:
+                rows = dict(self._conn.execute(
+                    'SELECT key, expires FROM entries WHERE key IN (?, ?)', (old_key, new_key)
+                ).fetchall())
+                if old_key not in rows:
+                    return False
+                if new_key in rows:
+                    if rows[new_key] >= rows[old_key]:
+                        self._forget(old_key)
+                        return False
+                    self._forget(new_key)
+            cursor = self._conn.execute(
+                'UPDATE entries SET key = ?, params = ? WHERE key = ?', (new_key, json.dumps(params), old_key)
+            )
+        return cursor.rowcount > 0
+
+    def renew(self, key, timestamp, expires):
+        """Give an entry a new timestamp and expiry without rewriting its payload.
+
+        Returns (entry, size), or None if the entry is gone.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'UPDATE entries SET timestamp = ?, expires = ? WHERE key = ?',
+                (timestamp.timestamp(), expires.timestamp(), key)
+            )
+        if cursor.rowcount == 0:
+            return None
+        return self.read(key)
+
+    def _forget(self, key):
+        """Delete key and update the running totals; caller holds the lock"""
+        row = self._conn.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+        self._count -= 1
+        self._total_size -= row[0]
+        return True
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            return self._forget(key)
+
+    def keys(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT key FROM entries')]
+
+    def entries(self):
+        """(key, size) pairs, oldest write first"""
+        with self._lock:
+            return self._conn.execute('SELECT key, size FROM entries ORDER BY timestamp').fetchall()
+
+    def expired_keys(self, now):
+        """Keys whose entries expired before now"""
+        with self._lock:
+            rows = self._conn.execute('SELECT key FROM entries WHERE expires <= ?', (now.timestamp(),))
+            return [row[0] for row in rows]
+
+    def count(self):
+        return self._count
+
+    def count_expired(self, now):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM entries WHERE expires <= ?', (now.timestamp(),)
+            ).fetchone()[0]
+
+    def total_size(self):
+        """Total size of stored payloads in bytes"""
+        return self._total_size
+
+    def clear(self):
+        with self._lock, self._conn:
+            cursor = self._conn.execute('DELETE FROM entries')
+            self._count = 0
+            self._total_size = 0
+        return cursor.rowcount
+
+    def repair(self):
+        """Recompute the running count and size totals from the table"""
+        with self._lock:
+            self._count, self._total_size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+        return self._count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_file_cache(cache_dir, backend):
+    """One-shot import of legacy <key>.json cache files into backend.
+
+    Files are removed once imported and corrupt ones are quarantined. If
+    reading or writing fails otherwise (e.g. a full disk), the migration
+    stops and the remaining files are kept for the next start. The file
+    backend's manifest is removed once every file has been imported.
+    Returns the number imported.
+    """
+    migrated = 0
+    for cache_file in cache_dir.glob('*.json'):
+        try:
+            entry, _ = read_entry_file(cache_file)
+        except ValueError as e:
+            quarantine(cache_file, e)
+            continue
+        except OSError as e:
+            print(f"Cache migration error for {cache_file.name}: {e}")
+            return migrated
+        try:
+            backend.write(cache_file.stem, entry)
+        except Exception as e:
+            print(f"Cache migration error for {cache_file.name}: {e}")
+            return migrated
+        migrated += 1
+        try:
+            os.remove(cache_file)
+        except OSError:
+            pass
+    if not any(cache_dir.glob('*.json')):
+        (cache_dir / MANIFEST_FILE).unlink(missing_ok=True)
+    return migrated
@@ -1,148 +1,510 @@
 import json
-import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import hashlib
+from config import (
+    CACHE_BACKEND,
+    CACHE_KEY_IGNORED_PARAMS,
+    CACHE_MAX_BYTES,
+    CACHE_MAX_ENTRIES,
+    CACHE_EVICTION_POLICY,
+    CACHE_COMPRESSION,
+    CACHE_COMPRESSION_THRESHOLD,
+)
+from utils.compression import resolve_codec
+from utils.cache_backends import FileCacheBackend, SQLiteCacheBackend, entry_expiry, migrate_file_cache
+from utils.eviction import create_policy
+from utils.fileio import atomic_write
+
+# Bump when the cache key derivation changes; stored entries are then
+# moved to the new keys once (see migrate_keys)
+KEY_FORMAT = 2
+KEY_FORMAT_FILE = 'key_format'
+
+
+def decoded_size(data):
+    """Size of data as uncompressed JSON, what it costs the memory tier"""
+    return len(json.dumps(data))
+
+
+class MemoryCache:
+    """Bounded in-process LRU of decoded cache entries"""
+    
+    def __init__(self, max_entries=128, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key):
+        """Return (expires, data) for key and mark it recently used"""
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        self._entries.move_to_end(key)
+        return item[0], item[1]
+    
+    def peek(self, key):
+        """Return (expires, data) for key without changing its recency"""
+        item = self._entries.get(key)
+        return None if item is None else (item[0], item[1])
+    
+    def put(self, key, expires, data, size):
+        """Insert an entry, evicting least recently used ones past the limits"""
+        self.pop(key)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        self._entries[key] = (expires, data, size)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+    
+    def pop(self, key):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.total_bytes -= item[2]
+    
+    def drop_expired(self, now):
+        """Remove entries that expired before now"""
+        expired = [key for key, item in self._entries.items() if item[0] <= now]
+        for key in expired:
+            self.pop(key)
+        return len(expired)
+    
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
 
 
 class CacheManager:
     """Manage API response caching with expiration"""
     
-    def __init__(self, cache_days=2):
+    def __init__(self, cache_days=2, backend=CACHE_BACKEND, memory_entries=128, memory_bytes=8 * 1024 * 1024,
+                 max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES, eviction_policy=CACHE_EVICTION_POLICY,
+                 compression=CACHE_COMPRESSION, compress_threshold=CACHE_COMPRESSION_THRESHOLD,
+                 ignored_params=CACHE_KEY_IGNORED_PARAMS):
         self.cache_dir = Path.home() / '.gua_app' / 'cache'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ignored_params = frozenset(ignored_params)
         self.cache_days = cache_days
         self.cache_duration = timedelta(days=cache_days)
+        self.codec = resolve_codec(compression)
+        self.compress_threshold = compress_threshold
+        self.backend = self._create_backend(backend)
+        self.migrate_keys()
+        self.memory = MemoryCache(memory_entries, memory_bytes)
+        self.stats = {
+            'memory_hits': 0, 'memory_misses': 0, 'disk_hits': 0, 'disk_misses': 0,
+            'stale_hits': 0, 'fallback_hits': 0, 'evictions': 0, 'evicted_bytes': 0,
+            'revalidations': 0, 'bytes_saved': 0
+        }
+        self._lock = threading.RLock()
+        
+        # Size budget, enforced on every set
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.policy = create_policy(eviction_policy)
+        for cache_key, size in self.backend.entries():
+            self.policy.on_insert(cache_key, size)
+        with self._lock:
+            self._enforce_limits()
+    
+    def _create_backend(self, backend):
+        """Build the storage backend selected by name ('file' or 'sqlite')"""
+        if backend == 'file':
+            return FileCacheBackend(self.cache_dir, self.cache_duration, self.codec, self.compress_threshold)
+        if backend == 'sqlite':
+            sqlite_backend = SQLiteCacheBackend(
+                self.cache_dir / 'cache.db', self.cache_duration, self.codec, self.compress_threshold
+            )
+            # Import entries left behind by the file backend
+            migrated = migrate_file_cache(self.cache_dir, sqlite_backend)
+            if migrated:
+                print(f"Migrated {migrated} cache files to SQLite")
+                # Imported files may still use an old key format
+                (self.cache_dir / KEY_FORMAT_FILE).unlink(missing_ok=True)
+            return sqlite_backend
+        raise ValueError(f"Unknown cache backend: {backend}")
+    
+    def canonical_request(self, url, params=None):
+        """Reduce a request to what identifies its response: (url, params).
+        
+        Scheme and host are lowercased and a trailing slash dropped; query
+        parameters in the URL are merged into params. Ignored parameters
+        (the API key) and None values are removed, the rest are turned into
+        strings the way they are sent and sorted by name.
+        """
+        parts = urlsplit(url)
+        path = parts.path.rstrip('/') or '/'
+        url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+        merged = dict(parse_qsl(parts.query))
+        merged.update(params or {})
+        canonical = {
+            str(name): self._canonical_value(value)
+            for name, value in merged.items()
+            if name not in self.ignored_params and value is not None
+        }
+        return url, dict(sorted(canonical.items()))
+    
+    @classmethod
+    def _canonical_value(cls, value):
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        if isinstance(value, (list, tuple)):
+            return ','.join(cls._canonical_value(item) for item in value)
+        return str(value).strip()
     
     def _get_cache_key(self, url, params=None):
-        """Generate unique cache key from URL and params"""
-        cache_string = url
-        if params:
-            # Sort params for consistent keys
-            sorted_params = sorted(params.items())
-            cache_string += str(sorted_params)
-        return hashlib.md5(cache_string.encode()).hexdigest()
-    
-    def _get_cache_file(self, cache_key):
-        """Get cache file path"""
-        return self.cache_dir / f"{cache_key}.json"
+        """Generate unique cache key from the canonical URL and params"""
+        url, params = self.canonical_request(url, params)
+        return hashlib.md5(f"{url}?{urlencode(params)}".encode()).hexdigest()
+    
+    def migrate_keys(self):
+        """Move entries stored under an older key format to canonical keys (runs once).
+        
+        Older keys hashed the API key into every entry and stored it in the
+        entry's params; both are removed here, so rotating the key keeps
+        the cache valid.
+        """
+        marker = self.cache_dir / KEY_FORMAT_FILE
+        try:
+            if marker.read_text().strip() == str(KEY_FORMAT):
+                return 0
+        except OSError:
+            pass
+        
+        moved = 0
+        for old_key, url, params in self.backend.requests():
+            if not url:
+                continue
+            try:
+                _, canonical_params = self.canonical_request(url, params)
+                new_key = self._get_cache_key(url, params)
+                if new_key != old_key or canonical_params != (params or {}):
+                    if self.backend.rekey(old_key, new_key, canonical_params):
+                        moved += 1
+            except Exception as e:
+                print(f"Cache key migration error: {e}")
+        atomic_write(marker, str(KEY_FORMAT))
+        if moved:
+            print(f"Moved {moved} cache entries to canonical keys")
+        return moved
     
     def get(self, url, params=None):
         """Get cached data if valid"""
+        entry = self.get_entry(url, params)
+        return entry[0] if entry else None
+    
+    def get_entry(self, url, params=None, stale_grace=None, keep_expired=False):
+        """Get (data, is_stale) for a cached response, or None.
+        
+        With stale_grace (a timedelta), entries that expired less than
+        stale_grace ago are still returned, flagged as stale, so the caller
+        can serve them while refreshing in the background. Entries past
+        that are deleted unless keep_expired is set (see get_fallback).
+        """
         cache_key = self._get_cache_key(url, params)
-        cache_file = self._get_cache_file(cache_key)
+        now = datetime.now()
+        grace = stale_grace or timedelta(0)
         
-        if not cache_file.exists():
-            return None
+        # Memory tier
+        with self._lock:
+            item = self.memory.get(cache_key)
+            if item is not None:
+                expires, data = item
+                if now < expires + grace:
+                    self.stats['memory_hits'] += 1
+                    self.policy.on_access(cache_key)
+                    return self._served(data, now >= expires)
+                self.memory.pop(cache_key)
+            self.stats['memory_misses'] += 1
         
+        # Disk tier
         try:
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
+            stored = self.backend.read(cache_key)
+            if stored is None:
+                self._count('disk_misses')
+                return None
+            
+            cache_data = stored[0]
             
             # Check expiration
-            cached_time = datetime.fromisoformat(cache_data['timestamp'])
-            if datetime.now() - cached_time > self.cache_duration:
+            expires = entry_expiry(cache_data, self.cache_duration)
+            if now >= expires + grace:
+                if keep_expired:
+                    self._count('disk_misses')
+                    return None
                 # Cache expired, delete it
-                os.remove(cache_file)
+                self.backend.delete(cache_key)
+                with self._lock:
+                    self.stats['disk_misses'] += 1
+                    self.policy.on_remove(cache_key)
                 return None
             
-            return cache_data['data']
+            memory_size = decoded_size(cache_data['data'])
+            with self._lock:
+                self.stats['disk_hits'] += 1
+                self.policy.on_access(cache_key)
+                self.memory.put(cache_key, expires, cache_data['data'], memory_size)
+                return self._served(cache_data['data'], now >= expires)
         except Exception as e:
             print(f"Cache read error: {e}")
+            self._count('disk_misses')
             return None
     
-    def set(self, url, params, data):
-        """Save data to cache"""
+    def get_fallback(self, url, params=None):
+        """Cached data for a request however old it is, or None.
+        
+        Used when the API cannot be reached; expired entries are only
+        removed by clear_expired() and eviction.
+        """
         cache_key = self._get_cache_key(url, params)
-        cache_file = self._get_cache_file(cache_key)
+        with self._lock:
+            item = self.memory.peek(cache_key)
+            if item is not None:
+                self.stats['fallback_hits'] += 1
+                return item[1]
+        try:
+            stored = self.backend.read(cache_key)
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            return None
+        if stored is None:
+            return None
+        self._count('fallback_hits')
+        return stored[0]['data']
+    
+    def get_many(self, requests):
+        """Fresh cached data for many (url, params) pairs, as a list aligned with requests.
+        
+        Misses and expired entries are None. Entries not in memory are read
+        from disk in a single backend call.
+        """
+        keys = [self._get_cache_key(url, params) for url, params in requests]
+        now = datetime.now()
+        results = [None] * len(keys)
+        missing = {}
+        
+        with self._lock:
+            for index, cache_key in enumerate(keys):
+                item = self.memory.get(cache_key)
+                if item is not None and now < item[0]:
+                    self.stats['memory_hits'] += 1
+                    self.policy.on_access(cache_key)
+                    results[index] = item[1]
+                else:
+                    self.stats['memory_misses'] += 1
+                    missing.setdefault(cache_key, []).append(index)
+        if not missing:
+            return results
         
         try:
+            stored = self.backend.read_many(missing)
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            stored = {}
+        
+        fresh = {}
+        for cache_key, (cache_data, _) in stored.items():
+            expires = entry_expiry(cache_data, self.cache_duration)
+            if now < expires:
+                fresh[cache_key] = (expires, cache_data['data'], decoded_size(cache_data['data']))
+        
+        with self._lock:
+            for cache_key, indexes in missing.items():
+                found = fresh.get(cache_key)
+                if found is None:
+                    self.stats['disk_misses'] += len(indexes)
+                    continue
+                expires, data, memory_size = found
+                self.stats['disk_hits'] += len(indexes)
+                self.policy.on_access(cache_key)
+                self.memory.put(cache_key, expires, data, memory_size)
+                for index in indexes:
+                    results[index] = data
+        return results
+    
+    def is_fresh(self, url, params=None):
+        """True if a non-expired entry exists; unlike get(), counts no hits and promotes nothing.
+        
+        Only the entry's expiry is looked up, the payload is not read or decoded.
+        """
+        cache_key = self._get_cache_key(url, params)
+        now = datetime.now()
+        with self._lock:
+            item = self.memory.peek(cache_key)
+            if item is not None and now < item[0]:
+                return True
+        try:
+            expires = self.backend.expiry(cache_key)
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            return False
+        return expires is not None and now < expires
+    
+    def _served(self, data, is_stale):
+        if is_stale:
+            self.stats['stale_hits'] += 1
+        return data, is_stale
+    
+    def set(self, url, params, data, ttl=None, validators=None):
+        """Save data to cache, expiring after ttl (defaults to cache_duration).
+        
+        validators holds what is needed to revalidate the response later:
+        its 'etag', 'last_modified' and body size in 'bytes'.
+        """
+        cache_key = self._get_cache_key(url, params)
+        
+        try:
+            cached_time = datetime.now()
+            expires = cached_time + (ttl or self.cache_duration)
             cache_data = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': cached_time.isoformat(),
+                'expires': expires.isoformat(),
                 'url': url,
-                'params': params,
+                # Without ignored params, so the API key is never written to disk
+                'params': self.canonical_request(url, params)[1],
                 'data': data
             }
+            if validators:
+                cache_data['validators'] = validators
             
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
+            # Write-through: disk first, then the memory tier. The disk
+            # budget counts stored (possibly compressed) bytes, the memory
+            # tier the decoded size.
+            size = self.backend.write(cache_key, cache_data)
+            memory_size = decoded_size(data)
             
+            with self._lock:
+                self.memory.put(cache_key, expires, data, memory_size)
+                self.policy.on_insert(cache_key, size)
+                self._enforce_limits()
             return True
         except Exception as e:
             print(f"Cache write error: {e}")
+            with self._lock:
+                self.memory.pop(cache_key)
             return False
     
+    def get_validators(self, url, params=None):
+        """Stored validators for a response, even an expired one, or None"""
+        try:
+            return self.backend.validators(self._get_cache_key(url, params))
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            return None
+    
+    def renew(self, url, params, ttl=None):
+        """Extend an entry the server reported unchanged (HTTP 304) and return its data.
+        
+        Only the timestamps are updated. Returns None if the entry is gone.
+        """
+        cache_key = self._get_cache_key(url, params)
+        cached_time = datetime.now()
+        expires = cached_time + (ttl or self.cache_duration)
+        try:
+            renewed = self.backend.renew(cache_key, cached_time, expires)
+        except Exception as e:
+            print(f"Cache write error: {e}")
+            return None
+        if renewed is None:
+            return None
+        
+        cache_data = renewed[0]
+        memory_size = decoded_size(cache_data['data'])
+        with self._lock:
+            self.stats['revalidations'] += 1
+            self.stats['bytes_saved'] += (cache_data.get('validators') or {}).get('bytes', 0)
+            self.memory.put(cache_key, expires, cache_data['data'], memory_size)
+            self.policy.on_access(cache_key)
+        return cache_data['data']
+    
+    def _enforce_limits(self):
+        """Evict entries chosen by the policy until within the size budget"""
+        while self.backend.count() > self.max_entries or self.backend.total_size() > self.max_bytes:
+            victim = self.policy.victim()
+            if victim is None:
+                break
+            size = self.policy.size_of(victim)
+            self.policy.on_remove(victim)
+            self.memory.pop(victim)
+            try:
+                self.backend.delete(victim)
+            except Exception as e:
+                print(f"Cache eviction error: {e}")
+                continue
+            self.stats['evictions'] += 1
+            self.stats['evicted_bytes'] += size
+    
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+    
+    def get_stats(self):
+        """Get hit/miss counters per cache tier"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self.memory)
+            stats['memory_bytes'] = self.memory.total_bytes
+        return stats
+    
     def clear_expired(self):
-        """Clear all expired cache files"""
-        if not self.cache_dir.exists():
-            return 0
+        """Clear all expired cache entries"""
+        now = datetime.now()
+        with self._lock:
+            self.memory.drop_expired(now)
         
         cleared = 0
-        for cache_file in self.cache_dir.glob('*.json'):
+        for cache_key in self.backend.expired_keys(now):
             try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                
-                cached_time = datetime.fromisoformat(cache_data['timestamp'])
-                if datetime.now() - cached_time > self.cache_duration:
-                    os.remove(cache_file)
+                if self.backend.delete(cache_key):
                     cleared += 1
             except Exception as e:
                 print(f"Error clearing cache: {e}")
+            with self._lock:
+                self.policy.on_remove(cache_key)
         
         return cleared
     
     def clear_all(self):
-        """Clear all cache files"""
-        if not self.cache_dir.exists():
-            return 0
-        
-        cleared = 0
-        for cache_file in self.cache_dir.glob('*.json'):
-            try:
-                os.remove(cache_file)
-                cleared += 1
-            except Exception as e:
-                print(f"Error clearing cache: {e}")
+        """Clear all cache entries"""
+        with self._lock:
+            self.memory.clear()
+            self.policy.clear()
         
-        return cleared
+        return self.backend.clear()
     
     def get_cache_size(self):
         """Get total cache size in MB"""
-        if not self.cache_dir.exists():
-            return 0
-        
-        total_size = 0
-        for cache_file in self.cache_dir.glob('*.json'):
-            total_size += cache_file.stat().st_size
-        
-        return total_size / (1024 * 1024)  # Convert to MB
+        return self.backend.total_size() / (1024 * 1024)  # Convert to MB
+    
+    def repair(self):
+        """Resynchronise the backend's statistics with what is stored"""
+        return self.backend.repair()
     
     def get_cache_info(self):
         """Get cache statistics"""
-        if not self.cache_dir.exists():
-            return {'count': 0, 'size_mb': 0, 'expired': 0}
-        
-        total = 0
-        expired = 0
-        
-        for cache_file in self.cache_dir.glob('*.json'):
-            total += 1
-            try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                
-                cached_time = datetime.fromisoformat(cache_data['timestamp'])
-                if datetime.now() - cached_time > self.cache_duration:
-                    expired += 1
-            except:
-                pass
-        
-        return {
-            'count': total,
+        info = {
+            'count': self.backend.count(),
             'size_mb': round(self.get_cache_size(), 2),
-            'expired': expired
+            'expired': self.backend.count_expired(datetime.now()),
+            'backend': self.backend.name,
+            'policy': self.policy.name,
+            'compression': self.codec or 'none',
+            'max_size_mb': round(self.max_bytes / (1024 * 1024), 2),
+            'max_entries': self.max_entries
         }
+        info.update(self.get_stats())
+        return info
 
 
 # Global cache instance
@@ -0,0 +1,120 @@
+import json
+import threading
+from bisect import bisect_right, insort
+from utils.fileio import atomic_write
+
+
+class CacheManifest:
+    """Running totals and per-entry expiry for the file cache backend.
+
+    The manifest is persisted as an append-only journal: every set/delete
+    appends one line, so updates are O(1) and statistics never need a
+    directory scan. The journal is compacted once it grows well past the
+    number of live entries.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.total_bytes = 0
+        self._by_expiry = []
+        self._journal_lines = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        return len(self.entries)
+
+    def load(self):
+        """Replay the journal; returns False if it is missing or unreadable"""
+        if not self.path.exists():
+            return False
+        with self._lock:
+            self._reset()
+            try:
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        self._apply(json.loads(line))
+                        self._journal_lines += 1
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Cache manifest corrupt: {e}")
+                self._reset()
+                return False
+        return True
+
+    def _reset(self):
+        self.entries = {}
+        self.total_bytes = 0
+        self._by_expiry = []
+        self._journal_lines = 0
+
+    def _apply(self, record):
+        """Apply one journal record to the in-memory state"""
+        op = record['op']
+        if op == 'set':
+            self._remove(record['key'])
+            self.entries[record['key']] = (record['size'], record['expires'])
+            self.total_bytes += record['size']
+            insort(self._by_expiry, (record['expires'], record['key']))
+        elif op == 'del':
+            self._remove(record['key'])
+
+    def _remove(self, key):
+        item = self.entries.pop(key, None)
+        if item is None:
+            return
+        size, expires = item
+        self.total_bytes -= size
+        index = bisect_right(self._by_expiry, (expires, key)) - 1
+        if index >= 0 and self._by_expiry[index] == (expires, key):
+            del self._by_expiry[index]
+
+    def _append(self, record):
+        self._apply(record)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        self._journal_lines += 1
+        if self._journal_lines > 2 * len(self.entries) + 100:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the journal as one 'set' line per live entry"""
+        lines = [
+            json.dumps({'op': 'set', 'key': key, 'size': size, 'expires': expires}) + '\n'
+            for key, (size, expires) in self.entries.items()
+        ]
+        atomic_write(self.path, ''.join(lines))
+        self._journal_lines = len(self.entries)
+
+    def record_set(self, key, size, expires):
+        """Record a written entry (expires is a POSIX timestamp)"""
+        with self._lock:
+            self._append({'op': 'set', 'key': key, 'size': size, 'expires': expires})
+
+    def record_delete(self, key):
+        with self._lock:
+            if key in self.entries:
+                self._append({'op': 'del', 'key': key})
+
+    def record_clear(self):
+        with self._lock:
+            self._reset()
+            self._compact()
+
+    def rebuild(self, entries):
+        """Replace the manifest with entries: iterable of (key, size, expires)"""
+        with self._lock:
+            self._reset()
+            for key, size, expires in entries:
+                self._apply({'op': 'set', 'key': key, 'size': size, 'expires': expires})
+            self._compact()
+
+    def expired_keys(self, now):
+        """Keys expiring at or before now (a POSIX timestamp)"""
+        with self._lock:
+            index = bisect_right(self._by_expiry, (now, '\uffff'))
+            return [key for _, key in self._by_expiry[:index]]
+
+    def count_expired(self, now):
+        with self._lock:
+            return bisect_right(self._by_expiry, (now, '\uffff'))
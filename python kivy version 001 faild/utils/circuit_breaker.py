@@ -0,0 +1,69 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops calling a service that keeps failing.
+
+    Closed: calls go through and consecutive failures are counted. After
+    `threshold` of them the breaker opens and allow() refuses calls for
+    `reset_timeout` seconds. Then it is half-open: one trial call is let
+    through, and its outcome closes the breaker or opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold=5, reset_timeout=30):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opens = 0
+        self._open_until = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now):
+        if self._open_until is None:
+            return self.CLOSED
+        return self.OPEN if now < self._open_until else self.HALF_OPEN
+
+    def allow(self):
+        """True if a call may be made now"""
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.OPEN or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._open_until = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self._open(self.reset_timeout)
+
+    def trip(self, seconds):
+        """Open for at least `seconds`, e.g. when the service asks to be left alone"""
+        with self._lock:
+            self._open(max(seconds, self.reset_timeout))
+
+    def _open(self, seconds):
+        if self._state(time.monotonic()) != self.OPEN:
+            self.opens += 1
+        self._open_until = time.monotonic() + seconds
+        self._trial = False
@@ -0,0 +1,72 @@
+import lzma
+import zlib
+
+# Compressed payloads start with MAGIC followed by a one-byte codec id.
+# Anything else is a legacy, uncompressed JSON payload and is returned as is.
+MAGIC = b'GUAZ'
+
+CODECS = {
+    'zlib': (1, lambda raw: zlib.compress(raw, 6), zlib.decompress),
+    'lzma': (2, lambda raw: lzma.compress(raw, preset=1), lzma.decompress),
+}
+
+# Faster codecs are used when installed
+try:
+    import zstandard
+
+    CODECS['zstd'] = (
+        3,
+        lambda raw: zstandard.ZstdCompressor(level=3).compress(raw),
+        lambda blob: zstandard.ZstdDecompressor().decompress(blob),
+    )
+except ImportError:
+    pass
+
+try:
+    import lz4.frame
+
+    CODECS['lz4'] = (4, lz4.frame.compress, lz4.frame.decompress)
+except ImportError:
+    pass
+
+_DECODERS = {codec_id: decompress for codec_id, _, decompress in CODECS.values()}
+
+
+def resolve_codec(name):
+    """Map a configured codec name to an available one ('auto' picks the fastest)"""
+    if not name:
+        return None
+    if name == 'auto':
+        for candidate in ('zstd', 'lz4', 'zlib'):
+            if candidate in CODECS:
+                return candidate
+    if name not in CODECS:
+        print(f"Compression codec '{name}' unavailable, using zlib")
+        return 'zlib'
+    return name
+
+
+def encode(raw, codec=None, threshold=0):
+    """Compress raw bytes with codec when they are at least threshold bytes"""
+    if codec is None or len(raw) < threshold:
+        return raw
+    codec_id, compress, _ = CODECS[codec]
+    return MAGIC + bytes([codec_id]) + compress(raw)
+
+
+def decode(blob):
+    """Return the raw bytes of a payload written by encode (or a legacy one)"""
+    if not blob.startswith(MAGIC):
+        return blob
+    if len(blob) <= len(MAGIC):
+        raise ValueError("Truncated compressed payload")
+    codec_id = blob[len(MAGIC)]
+    try:
+        decompress = _DECODERS[codec_id]
+    except KeyError:
+        raise ValueError(f"Payload compressed with unavailable codec id {codec_id}")
+    try:
+        return decompress(blob[len(MAGIC) + 1:])
+    except Exception as e:
+        # Truncated or damaged streams surface as codec-specific errors
+        raise ValueError(f"Corrupt compressed payload: {e}")
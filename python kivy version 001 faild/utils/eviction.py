@@ -0,0 +1,151 @@
+import heapq
+import itertools
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class LRUPolicy:
+    """Evict the least recently used entry"""
+
+    name = 'lru'
+
+    def __init__(self):
+        self._order = OrderedDict()
+
+    def __len__(self):
+        return len(self._order)
+
+    def size_of(self, key):
+        return self._order.get(key, 0)
+
+    def on_insert(self, key, size):
+        self._order.pop(key, None)
+        self._order[key] = size
+
+    def on_access(self, key):
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def on_remove(self, key):
+        self._order.pop(key, None)
+
+    def victim(self):
+        """Key to evict next, or None when empty"""
+        return next(iter(self._order), None)
+
+    def clear(self):
+        self._order.clear()
+
+
+class _HeapPolicy(ABC):
+    """Priority-queue policy; the entry with the lowest priority is evicted.
+
+    Heap items are invalidated lazily: each key carries a version and stale
+    heap items are skipped when they surface.
+    """
+
+    name = None
+
+    def __init__(self):
+        self._entries = {}
+        self._heap = []
+        self._tick = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def size_of(self, key):
+        entry = self._entries.get(key)
+        return entry['size'] if entry else 0
+
+    @abstractmethod
+    def _priority(self, entry):
+        """Priority of an entry as of now; computed only when it is inserted or used"""
+
+    def _push(self, key, entry):
+        entry['version'] = next(self._tick)
+        entry['priority'] = self._priority(entry)
+        heapq.heappush(self._heap, (entry['priority'], entry['version'], key))
+        # Rebuild once stale items dominate so the heap stays O(live entries).
+        # Reuse the stored priorities: recomputing would make idle entries look fresh.
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [
+                (e['priority'], e['version'], k) for k, e in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def on_insert(self, key, size):
+        entry = {'size': max(size, 1), 'hits': 1}
+        self._entries[key] = entry
+        self._push(key, entry)
+
+    def on_access(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry['hits'] += 1
+            self._push(key, entry)
+
+    def on_remove(self, key):
+        self._entries.pop(key, None)
+
+    def victim(self):
+        """Key to evict next, or None when empty"""
+        while self._heap:
+            priority, version, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry['version'] == version:
+                self._on_victim(priority)
+                return key
+            heapq.heappop(self._heap)
+        return None
+
+    def _on_victim(self, priority):
+        pass
+
+    def clear(self):
+        self._entries.clear()
+        self._heap = []
+
+
+class LFUPolicy(_HeapPolicy):
+    """Evict the least frequently used entry (oldest first on ties)"""
+
+    name = 'lfu'
+
+    def _priority(self, entry):
+        return entry['hits']
+
+
+class GDSFPolicy(_HeapPolicy):
+    """Greedy-Dual-Size-Frequency: prefer evicting large, rarely used entries.
+
+    priority = L + hits / size, where L is raised to the priority of each
+    evicted entry so long-idle entries age out.
+    """
+
+    name = 'gdsf'
+
+    def __init__(self):
+        super().__init__()
+        self._inflation = 0.0
+
+    def _priority(self, entry):
+        return self._inflation + entry['hits'] / entry['size']
+
+    def _on_victim(self, priority):
+        self._inflation = priority
+
+    def clear(self):
+        super().clear()
+        self._inflation = 0.0
+
+
+POLICIES = {policy.name: policy for policy in (LRUPolicy, LFUPolicy, GDSFPolicy)}
+
+
+def create_policy(name):
+    """Build an eviction policy by name ('lru', 'lfu' or 'gdsf')"""
+    try:
+        return POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown eviction policy: {name}")
@@ -0,0 +1,63 @@
+import os
+import threading
+from datetime import datetime
+
+
+def atomic_write(path, data, durable=True):
+    """Write data (bytes or str) to path so readers see the old or new file, never a partial one.
+
+    The data goes to a temporary file in the same directory, is fsynced, and
+    then renamed over the destination. With durable=False the fsyncs are
+    skipped: readers still never see a partial file, but a power loss may
+    lose the write. Fine for data that can be downloaded again.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if durable:
+        _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory):
+    """Persist a rename by syncing its directory (best effort, POSIX only)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except (OSError, AttributeError):
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def quarantine(path, reason=None):
+    """Move a corrupt file aside into a quarantine/ folder next to it"""
+    target_dir = path.parent / 'quarantine'
+    try:
+        target_dir.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        os.replace(path, target_dir / f"{path.name}.{stamp}")
+        print(f"Quarantined corrupt file {path.name}: {reason}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Could not quarantine {path.name}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
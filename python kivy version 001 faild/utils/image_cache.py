@@ -0,0 +1,332 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+from config import (
+    IMAGE_CACHE_MAX_BYTES,
+    IMAGE_TEXTURE_CACHE_BYTES,
+    IMAGE_WIDTHS,
+    IMAGE_WORKERS,
+)
+from utils.api_helper import SingleFlight, api
+from utils.fileio import atomic_write
+
+# Pillow does the local downscale and off-thread decode; without it images
+# are cached as downloaded and decoded by Kivy on the main thread
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+# https://media.rawg.io/media/games/<path> also exists as
+# https://media.rawg.io/media/resize/<width>/-/games/<path>
+RAWG_MEDIA = re.compile(r'^(https?://media\.rawg\.io/media/)(?!resize/|crop/)(.+)$')
+
+
+class TextureLRU:
+    """Decoded textures bounded by their approximate GPU size (w * h * 4)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._textures = OrderedDict()
+
+    def get(self, key):
+        texture = self._textures.get(key)
+        if texture is not None:
+            self._textures.move_to_end(key)
+        return texture
+
+    def put(self, key, texture):
+        if key in self._textures:
+            self.bytes -= self._size(self._textures.pop(key))
+        self._textures[key] = texture
+        self.bytes += self._size(texture)
+        while self.bytes > self.max_bytes and len(self._textures) > 1:
+            _, evicted = self._textures.popitem(last=False)
+            self.bytes -= self._size(evicted)
+
+    @staticmethod
+    def _size(texture):
+        width, height = texture.size
+        return width * height * 4
+
+    def clear(self):
+        self._textures.clear()
+        self.bytes = 0
+
+
+class ImageCache:
+    """Downloads, resizes and caches game artwork.
+
+    Lookup order: decoded textures in memory, resized files on disk under
+    ~/.gua_app/images, then a download on a small worker pool. RAWG media
+    URLs are fetched as the server-side resized variant closest to the
+    displayed width; other images are downscaled locally. Decoding happens
+    on the workers too, so the main thread only uploads the texture.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=IMAGE_CACHE_MAX_BYTES,
+                 texture_bytes=IMAGE_TEXTURE_CACHE_BYTES, widths=IMAGE_WIDTHS, workers=IMAGE_WORKERS):
+        self.cache_dir = cache_dir or Path.home() / '.gua_app' / 'images'
+        self.max_bytes = max_bytes
+        self.widths = sorted(widths)
+        self.workers = workers
+        self.textures = TextureLRU(texture_bytes)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._inflight = SingleFlight()
+        self._files = None          # path -> size, least recently used first
+        self._disk_bytes = 0
+        self._stats = {}
+
+    @property
+    def executor(self):
+        """Worker pool, created on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='gua-image')
+        return self._executor
+
+    def variant_width(self, width):
+        """Smallest configured width that still covers width pixels"""
+        for candidate in self.widths:
+            if candidate >= width:
+                return candidate
+        return self.widths[-1]
+
+    @staticmethod
+    def source_url(url, width):
+        """URL of the server-side resized variant, or the original when the host has none"""
+        match = RAWG_MEDIA.match(url)
+        if match is None:
+            return url
+        return f"{match.group(1)}resize/{width}/-/{match.group(2)}"
+
+    def _cache_path(self, url, width):
+        name = hashlib.md5(f"{url}|{width}".encode()).hexdigest()
+        return self.cache_dir / f"{name}.jpg"
+
+    def _record(self, label, name, amount=1):
+        with self._lock:
+            stats = self._stats.setdefault(label or 'other', {
+                'requests': 0, 'memory_hits': 0, 'disk_hits': 0, 'downloads': 0,
+                'bytes_downloaded': 0, 'decode_ms': 0.0
+            })
+            stats[name] += amount
+
+    def get_stats(self):
+        """Counters per label (usually the screen that showed the image)"""
+        with self._lock:
+            return {label: dict(stats) for label, stats in self._stats.items()}
+
+    def load(self, url, width, on_ready, label=None):
+        """Deliver a texture for url at roughly width pixels to on_ready(texture) on the main thread"""
+        width = self.variant_width(width)
+        key = (url, width)
+        self._record(label, 'requests')
+
+        texture = self.textures.get(key)
+        if texture is not None:
+            self._record(label, 'memory_hits')
+            on_ready(texture)
+            return
+
+        future = self.executor.submit(self._inflight.do, key, self._load_pixels, url, width, label)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._deliver(key, f, on_ready), 0)
+        )
+
+    def _deliver(self, key, future, on_ready):
+        """Upload decoded pixels as a texture on the main thread"""
+        if future.exception() is not None:
+            print(f"Image error: {future.exception()}")
+            return
+        result = future.result()
+        if result is None:
+            return
+
+        # Concurrent loads of the same image share one decode; upload it once
+        texture = self.textures.get(key)
+        if texture is None:
+            texture = self._to_texture(result)
+            if texture is None:
+                return
+            self.textures.put(key, texture)
+        on_ready(texture)
+
+    @staticmethod
+    def _to_texture(result):
+        kind, value = result
+        if kind == 'path':
+            # No Pillow: let Kivy decode the cached file
+            from kivy.core.image import Image as CoreImage
+            try:
+                return CoreImage(str(value)).texture
+            except Exception as e:
+                print(f"Image decode error: {e}")
+                return None
+        size, pixels = value
+        texture = Texture.create(size=size, colorfmt='rgba')
+        texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+        texture.flip_vertical()
+        return texture
+
+    def _load_pixels(self, url, width, label):
+        """Worker: find or fetch the resized file and decode it"""
+        path = self._cache_path(url, width)
+        if self._touch(path):
+            self._record(label, 'disk_hits')
+        else:
+            data = self._download(url, width, label)
+            if data is None:
+                return None
+            self._store(path, data)
+
+        if PILImage is None:
+            return 'path', path
+
+        started = time.perf_counter()
+        try:
+            with PILImage.open(path) as image:
+                image = image.convert('RGBA')
+                pixels = image.tobytes()
+                size = image.size
+        except Exception as e:
+            print(f"Image decode error: {e}")
+            self._remove(path)
+            return None
+        self._record(label, 'decode_ms', (time.perf_counter() - started) * 1000)
+        return 'pixels', (size, pixels)
+
+    def _download(self, url, width, label):
+        """Fetch the image, preferring a server-resized variant, and shrink it if needed"""
+        resized_url = self.source_url(url, width)
+        response = None
+        try:
+            response = api.session.get(resized_url, timeout=api.timeout)
+            if response.status_code != 200 and resized_url != url:
+                response = api.session.get(url, timeout=api.timeout)
+            if response.status_code != 200:
+                print(f"Image download failed ({response.status_code}): {url}")
+                return None
+        except Exception as e:
+            print(f"Image download error: {e}")
+            return None
+
+        data = response.content
+        self._record(label, 'downloads')
+        self._record(label, 'bytes_downloaded', len(data))
+        return self._downscale(data, width)
+
+    @staticmethod
+    def _downscale(data, width):
+        """Shrink an image wider than width pixels (needs Pillow)"""
+        if PILImage is None:
+            return data
+        try:
+            with PILImage.open(BytesIO(data)) as image:
+                if image.width <= width:
+                    return data
+                height = max(1, round(image.height * width / image.width))
+                image = image.convert('RGB').resize((width, height), PILImage.BILINEAR)
+                out = BytesIO()
+                image.save(out, 'JPEG', quality=85)
+                return out.getvalue()
+        except Exception as e:
+            print(f"Image resize error: {e}")
+            return data
+
+    def _load_index(self):
+        """Disk index of cached files, least recently used first; called with the lock held"""
+        if self._files is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            files = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".jpg"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, Path(entry.path), stat.st_size))
+            files.sort()
+            self._files = OrderedDict((path, size) for _, path, size in files)
+            self._disk_bytes = sum(self._files.values())
+        return self._files
+
+    def _touch(self, path):
+        """Mark a cached file as recently used; False if it is not cached"""
+        with self._lock:
+            files = self._load_index()
+            if path not in files:
+                return False
+            files.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            self._remove(path)
+            return False
+        return True
+
+    def _store(self, path, data):
+        """Write an image file and evict the least recently used past the budget"""
+        # Thumbnails can be downloaded again, so skip the per-image fsyncs
+        atomic_write(path, data, durable=False)
+        evicted = []
+        with self._lock:
+            files = self._load_index()
+            self._disk_bytes += len(data) - files.pop(path, 0)
+            files[path] = len(data)
+            while self._disk_bytes > self.max_bytes and len(files) > 1:
+                old_path, size = files.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_path)
+        for old_path in evicted:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    def _remove(self, path):
+        with self._lock:
+            if self._files is not None and path in self._files:
+                self._disk_bytes -= self._files.pop(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get_size(self):
+        """Disk cache size in MB"""
+        with self._lock:
+            self._load_index()
+            return round(self._disk_bytes / (1024 * 1024), 2)
+
+    def clear(self):
+        """Delete cached images from disk and memory"""
+        with self._lock:
+            files = list(self._load_index())
+            self._files = OrderedDict()
+            self._disk_bytes = 0
+        for path in files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.textures.clear()
+        return len(files)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global image cache instance
+image_cache = ImageCache()
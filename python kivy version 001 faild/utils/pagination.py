@@ -0,0 +1,174 @@
+from collections import deque
+from config import PAGE_WINDOW
+from utils.api_helper import api
+from utils.async_api import async_api
+
+
+class PagedResults:
+    """Sliding window over a paginated RAWG listing.
+
+    Later pages are reached by following each response's `next` link, and
+    the page after the last one shown is prefetched in the background so it
+    is ready by the time the user scrolls to it. Every page goes through
+    APIHelper and is cached like any other response. At most max_pages
+    pages are kept; pages far from the viewport are dropped and read back
+    (usually from the cache) through `previous` links when scrolled to again.
+
+    The view is told about changes on the main thread through
+    clear_games(), page_appended(games), page_prepended(games),
+    head_dropped(count) and tail_dropped(count).
+    """
+
+    def __init__(self, view, first_page=None, endpoint='games', max_pages=PAGE_WINDOW,
+                 owner=None, on_page=None, on_error=None):
+        self.view = view
+        self.first_page = first_page
+        self.endpoint = endpoint
+        self.max_pages = max_pages
+        self.owner = owner
+        self.on_page = on_page
+        self.on_error = on_error
+        self.total = None
+        self._pages = deque()   # (page number, result count) currently shown
+        self._links = {}        # page number -> {'next': url, 'previous': url}
+        self._ready = {}        # prefetched page number -> results
+        self._inflight = {}     # page number -> AsyncRequest
+        self._wanted = None     # (page number, at_end) waiting to be shown
+
+    @property
+    def loading(self):
+        """True while a page the user is waiting for is being fetched"""
+        if self._wanted is None:
+            return False
+        request = self._inflight.get(self._wanted[0])
+        return request is not None and not request.cancelled
+
+    @property
+    def has_pages(self):
+        return bool(self._pages)
+
+    @property
+    def has_more(self):
+        """True if there are pages after the last one shown"""
+        return bool(self._pages) and bool(self._links.get(self._pages[-1][0], {}).get('next'))
+
+    def reset(self):
+        """Forget all pages and cancel outstanding requests"""
+        for request in self._inflight.values():
+            request.cancel()
+        self._inflight.clear()
+        self._ready.clear()
+        self._links.clear()
+        self._pages.clear()
+        self._wanted = None
+        self.total = None
+
+    def start(self, first_page=None):
+        """Load the first page; what is shown stays until it arrives"""
+        if first_page is not None:
+            self.first_page = first_page
+        self.reset()
+        self._want(1, at_end=True)
+
+    def load_next(self):
+        """Show the page after the last one (the view calls this near the end)"""
+        if self.has_more:
+            self._want(self._pages[-1][0] + 1, at_end=True)
+
+    def load_previous(self):
+        """Show the page before the first one after it was dropped"""
+        if self._pages and self._pages[0][0] > 1:
+            self._want(self._pages[0][0] - 1, at_end=False)
+
+    def _want(self, number, at_end):
+        if number in self._ready:
+            self._show(number, self._ready.pop(number), at_end)
+        else:
+            self._wanted = (number, at_end)
+            self._fetch(number)
+
+    def _source(self, number):
+        """Return (func, args) that fetches page number, or None if no link leads to it"""
+        if number == 1:
+            return self.first_page, ()
+        next_url = self._links.get(number - 1, {}).get('next')
+        if next_url:
+            return api.get_page, (next_url, self.endpoint)
+        previous_url = self._links.get(number + 1, {}).get('previous')
+        if previous_url:
+            return api.get_page, (previous_url, self.endpoint)
+        return None
+
+    def _fetch(self, number):
+        request = self._inflight.get(number)
+        if request is not None and not request.cancelled:
+            return
+        source = self._source(number)
+        if source is None:
+            return
+        func, args = source
+        self._inflight[number] = async_api.submit(
+            func, *args,
+            on_result=lambda data: self._on_page(number, data),
+            on_error=lambda error: self._on_failure(number, error),
+            owner=self.owner
+        )
+
+    def _on_page(self, number, data):
+        self._inflight.pop(number, None)
+        if not data:
+            self._on_failure(number, None)
+            return
+
+        self._links[number] = {'next': data.get('next'), 'previous': data.get('previous')}
+        self.total = data.get('count', self.total)
+        games = data.get('results', [])
+
+        if self._wanted is not None and self._wanted[0] == number:
+            _, at_end = self._wanted
+            self._wanted = None
+            self._show(number, games, at_end)
+        else:
+            # Prefetched; shown when the user scrolls to it
+            self._ready[number] = games
+
+    def _on_failure(self, number, error):
+        self._inflight.pop(number, None)
+        if self._wanted is not None and self._wanted[0] == number:
+            self._wanted = None
+            if self.on_error:
+                self.on_error(error)
+            else:
+                print(f"Error loading page {number}: {error}")
+
+    def _show(self, number, games, at_end):
+        """Add a page at one end of the window and trim the other end"""
+        if at_end:
+            if self._pages and number != self._pages[-1][0] + 1:
+                return
+            if not self._pages:
+                self.view.clear_games()
+            self._pages.append((number, len(games)))
+            self.view.page_appended(games)
+            if len(self._pages) > self.max_pages:
+                _, count = self._pages.popleft()
+                self.view.head_dropped(count)
+        else:
+            if not self._pages or number != self._pages[0][0] - 1:
+                return
+            self._pages.appendleft((number, len(games)))
+            self.view.page_prepended(games)
+            if len(self._pages) > self.max_pages:
+                _, count = self._pages.pop()
+                self.view.tail_dropped(count)
+
+        # Prefetched pages no longer next to the window are not needed
+        first, last = self._pages[0][0], self._pages[-1][0]
+        for stale in [n for n in self._ready if n not in (first - 1, last + 1)]:
+            del self._ready[stale]
+
+        if self.on_page:
+            self.on_page(number, games)
+
+        if at_end:
+            self._fetch(number + 1)
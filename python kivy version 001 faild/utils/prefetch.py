@@ -0,0 +1,189 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from kivy.utils import platform
+from config import (
+    PREFETCH_COUNT,
+    PREFETCH_ENABLED,
+    PREFETCH_METERED_CHECK,
+    PREFETCH_ON_METERED,
+    PREFETCH_RESERVE_TOKENS,
+    PREFETCH_WORKERS,
+)
+from utils.api_helper import api
+
+
+def is_metered():
+    """True on Android when the active network is metered (mobile data, hotspot)"""
+    if platform != 'android':
+        return False
+    try:
+        from jnius import autoclass
+    except ImportError:
+        return False
+    try:
+        activity = autoclass('org.kivy.android.PythonActivity').mActivity
+        context = autoclass('android.content.Context')
+        manager = activity.getSystemService(context.CONNECTIVITY_SERVICE)
+        return bool(manager.isActiveNetworkMetered())
+    except Exception as e:
+        print(f"Network check error: {e}")
+        return False
+
+
+class _Batch:
+    """Games queued for one list; cancelled when the list shows something else"""
+
+    def __init__(self):
+        self.cancelled = False
+
+
+class DetailPrefetcher:
+    """Warms the response cache with details of the games a list shows.
+
+    Lists hand over the ids in view once they stop scrolling; a small
+    dedicated pool fetches the ones not cached yet through APIHelper, so a
+    tap on one of them opens from the cache. Each list (owner) has at most
+    one batch queued: a new batch or cancel() drops what has not started.
+    pause() holds queued work while the user scrolls. Games are skipped
+    rather than fetched while the shared rate limiter is down to its last
+    `reserve_tokens`, so prefetch never delays a foreground request. Detail
+    opens are counted to report how often they were served from the cache.
+    """
+
+    def __init__(self, helper, count=PREFETCH_COUNT, workers=PREFETCH_WORKERS,
+                 enabled=PREFETCH_ENABLED, on_metered=PREFETCH_ON_METERED,
+                 metered_check=PREFETCH_METERED_CHECK, reserve_tokens=PREFETCH_RESERVE_TOKENS):
+        self.helper = helper
+        self.count = count
+        self.workers = workers
+        self.enabled = enabled
+        self.on_metered = on_metered
+        self.metered_check = metered_check
+        self.reserve_tokens = reserve_tokens
+        self._metered = False
+        self._metered_checked = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._batches = {}
+        self._running = threading.Event()
+        self._running.set()
+        self._prefetched = set()
+        self.stats = {
+            'queued': 0, 'prefetched': 0, 'already_cached': 0, 'cancelled': 0, 'failed': 0, 'busy': 0,
+            'opens': 0, 'open_hits': 0, 'open_hits_prefetched': 0
+        }
+
+    @property
+    def executor(self):
+        """Worker pool, created on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='gua-prefetch')
+        return self._executor
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def is_metered(self):
+        """is_metered(), re-checked at most every `metered_check` seconds.
+
+        prefetch() runs on the UI thread each time a list settles; the
+        Android query goes through pyjnius and is too slow to repeat there.
+        """
+        now = time.monotonic()
+        if self._metered_checked is None or now - self._metered_checked >= self.metered_check:
+            self._metered = is_metered()
+            self._metered_checked = now
+        return self._metered
+
+    def prefetch(self, owner, game_ids):
+        """Replace owner's queued batch with the first `count` of game_ids"""
+        self.cancel(owner)
+        if not self.enabled or (not self.on_metered and self.is_metered()):
+            return 0
+
+        wanted = list(dict.fromkeys(game_id for game_id in game_ids if game_id is not None))[:self.count]
+        batch = _Batch()
+        with self._lock:
+            self._batches[id(owner)] = batch
+            self.stats['queued'] += len(wanted)
+        for game_id in wanted:
+            self.executor.submit(self._warm, batch, game_id)
+        return len(wanted)
+
+    def cancel(self, owner):
+        """Drop owner's queued games; one already downloading still completes"""
+        with self._lock:
+            batch = self._batches.pop(id(owner), None)
+        if batch is not None:
+            batch.cancelled = True
+
+    def pause(self):
+        """Hold queued work, e.g. while a list is being scrolled"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def _warm(self, batch, game_id):
+        """Worker: fetch one game's details unless cancelled or already cached"""
+        while not batch.cancelled and not self._running.wait(0.25):
+            pass
+        if batch.cancelled:
+            self._count('cancelled')
+            return
+        if self.helper.has_game_details(game_id):
+            self._count('already_cached')
+            return
+        if self.helper.limiter.tokens <= self.reserve_tokens:
+            # Leave the remaining request budget to the foreground
+            self._count('busy')
+            return
+        try:
+            data = self.helper.get_game_details(game_id)
+        except Exception as e:
+            print(f"Prefetch error: {e}")
+            data = None
+        if data is None:
+            self._count('failed')
+            return
+        with self._lock:
+            self.stats['prefetched'] += 1
+            self._prefetched.add(game_id)
+
+    def record_open(self, game_id):
+        """Count a detail open and whether its data was already cached"""
+        cached = self.helper.has_game_details(game_id)
+        with self._lock:
+            self.stats['opens'] += 1
+            if cached:
+                self.stats['open_hits'] += 1
+                if game_id in self._prefetched:
+                    self.stats['open_hits_prefetched'] += 1
+        return cached
+
+    def get_stats(self):
+        """Counters plus the share of detail opens served from the cache"""
+        with self._lock:
+            stats = dict(self.stats)
+        opens = stats['opens']
+        stats['open_hit_rate'] = round(stats['open_hits'] / opens, 3) if opens else 0.0
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            batches = list(self._batches.values())
+            self._batches.clear()
+            executor, self._executor = self._executor, None
+        for batch in batches:
+            batch.cancelled = True
+        self._running.set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global detail prefetcher instance
+detail_prefetcher = DetailPrefetcher(api)
@@ -0,0 +1,54 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    Holds up to `burst` tokens and refills at `rate` tokens per second;
+    acquire() takes one, waiting for a refill when the bucket is empty.
+    A rate of 0 or None means unlimited. hold() stops all callers for a
+    while, e.g. when the server answers with Retry-After.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._held_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until one is available; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._held_until - now, 0.0)
+            if self.rate:
+                self._refill(now)
+                # Reserve the token now so concurrent callers queue up behind it
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def hold(self, seconds):
+        """Make every caller wait at least `seconds` from now"""
+        with self._lock:
+            self._held_until = max(self._held_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def tokens(self):
+        """Tokens currently available (negative while callers are waiting)"""
+        if not self.rate:
+            return float(self.burst)
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
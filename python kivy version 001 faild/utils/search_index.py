@@ -0,0 +1,239 @@
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class SearchIndex:
+    """Full-text index (SQLite FTS5) of every game the app has downloaded.
+
+    Games from list, search and detail responses are upserted as they pass
+    through APIHelper, so search works offline and returns instantly for
+    anything seen before. Name matches rank above genre, platform and
+    description matches. If the SQLite build lacks FTS5 the index is
+    disabled and search() returns nothing.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            card TEXT NOT NULL,
+            name TEXT NOT NULL,
+            genres TEXT NOT NULL DEFAULT '',
+            platforms TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '',
+            rating REAL NOT NULL DEFAULT 0
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+            name, genres, platforms, description,
+            content='games', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+        CREATE TRIGGER IF NOT EXISTS games_ai AFTER INSERT ON games BEGIN
+            INSERT INTO games_fts (rowid, name, genres, platforms, description)
+            VALUES (new.id, new.name, new.genres, new.platforms, new.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS games_ad AFTER DELETE ON games BEGIN
+            INSERT INTO games_fts (games_fts, rowid, name, genres, platforms, description)
+            VALUES ('delete', old.id, old.name, old.genres, old.platforms, old.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS games_au AFTER UPDATE ON games BEGIN
+            INSERT INTO games_fts (games_fts, rowid, name, genres, platforms, description)
+            VALUES ('delete', old.id, old.name, old.genres, old.platforms, old.description);
+            INSERT INTO games_fts (rowid, name, genres, platforms, description)
+            VALUES (new.id, new.name, new.genres, new.platforms, new.description);
+        END;
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    # bm25 weights for name, genres, platforms, description; stored as the
+    # table's rank function so ORDER BY rank can be evaluated inside FTS5
+    RANK = 'bm25(10.0, 3.0, 2.0, 0.5)'
+
+    # Fields kept for list cards; the rest of a payload is only indexed
+    CARD_FIELDS = ('id', 'name', 'background_image', 'rating', 'released')
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or Path.home() / '.gua_app' / 'search_index.db'
+        self.enabled = True
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open the database on first use; called with the lock held"""
+        if self._conn is None and self.enabled:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.executescript(self.SCHEMA)
+                conn.execute("INSERT INTO games_fts (games_fts, rank) VALUES ('rank', ?)", (self.RANK,))
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                print(f"Search index disabled: {e}")
+                conn.close()
+                self.enabled = False
+                return None
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _names(items, nested=None):
+        """Join the 'name' of each item (or of item[nested]) for indexing"""
+        names = []
+        for item in items or []:
+            if nested:
+                item = item.get(nested) or {}
+            if item.get('name'):
+                names.append(item['name'])
+        return ' '.join(names)
+
+    def _row(self, game):
+        card = {field: game.get(field) for field in self.CARD_FIELDS}
+        return (
+            int(game['id']),
+            json.dumps(card),
+            game.get('name') or '',
+            self._names(game.get('genres')),
+            self._names(game.get('platforms'), nested='platform'),
+            game.get('description_raw') or '',
+            game.get('rating') or 0,
+        )
+
+    def add_games(self, games):
+        """Insert or update games; fields missing from a payload keep their indexed value"""
+        rows = [self._row(game) for game in games if game.get('id') is not None and game.get('name')]
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO games (id, card, name, genres, platforms, description, rating)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        card = excluded.card,
+                        name = excluded.name,
+                        genres = CASE WHEN excluded.genres != '' THEN excluded.genres ELSE genres END,
+                        platforms = CASE WHEN excluded.platforms != '' THEN excluded.platforms ELSE platforms END,
+                        description = CASE WHEN excluded.description != '' THEN excluded.description ELSE description END,
+                        rating = excluded.rating
+                    """,
+                    rows
+                )
+        return len(rows)
+
+    def add_payload(self, data):
+        """Index the games in an API response (a result list or a single game)"""
+        if not isinstance(data, dict):
+            return 0
+        if isinstance(data.get('results'), list):
+            return self.add_games(data['results'])
+        if data.get('id') is not None:
+            return self.add_games([data])
+        return 0
+
+    @staticmethod
+    def _match_expression(query, column=None):
+        """Every word must match, each as a prefix ("zeld" finds "Zelda")"""
+        words = re.findall(r'\w+', query.casefold())
+        if not words:
+            return ''
+        expression = ' '.join(f'"{word}"*' for word in words)
+        return f'{column} : ({expression})' if column else expression
+
+    def _query(self, conn, expression, limit, exclude=()):
+        placeholders = ','.join('?' * len(exclude))
+        rows = conn.execute(
+            f"""
+            SELECT games.id, games.card FROM games_fts
+            JOIN games ON games.id = games_fts.rowid
+            WHERE games_fts MATCH ? {f'AND games.id NOT IN ({placeholders})' if exclude else ''}
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (expression, *exclude, limit)
+        ).fetchall()
+        return rows
+
+    def search(self, query, limit=15):
+        """Best matches for query as list-card dicts.
+
+        Name matches are looked up first; genres, platforms and descriptions
+        are only searched when names alone do not fill the limit, which
+        keeps common short prefixes from ranking every description.
+        """
+        if not self._match_expression(query):
+            return []
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            rows = self._query(conn, self._match_expression(query, 'name'), limit)
+            if len(rows) < limit:
+                found = [game_id for game_id, _ in rows]
+                rows += self._query(conn, self._match_expression(query), limit - len(rows), exclude=found)
+        return [json.loads(card) for _, card in rows]
+
+    def backfill(self, cache_manager):
+        """Index responses cached before the index existed (runs once)"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            done = conn.execute("SELECT value FROM meta WHERE key = 'backfilled'").fetchone()
+        if done:
+            return 0
+
+        indexed = 0
+        backend = cache_manager.backend
+        for key in backend.keys():
+            result = backend.read(key)
+            if result is not None:
+                entry, _ = result
+                indexed += self.add_payload(entry.get('data'))
+
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('backfilled', '1')")
+        print(f"Search index: indexed {indexed} cached games")
+        return indexed
+
+    def count(self):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            return conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def get_size(self):
+        """Index size on disk in MB"""
+        paths = [self.db_path, self.db_path.with_name(self.db_path.name + '-wal')]
+        return round(sum(path.stat().st_size for path in paths if path.exists()) / (1024 * 1024), 2)
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            with conn:
+                conn.execute('DELETE FROM games')
+                conn.execute("DELETE FROM meta WHERE key = 'backfilled'")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global search index instance
+search_index = SearchIndex()
@@ -0,0 +1,163 @@
+import os
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+from pathlib import Path
+
+# Set GUA_STARTUP_PROFILE=1 to write a startup report
+PROFILE_ENV = 'GUA_STARTUP_PROFILE'
+
+
+class _TimedLoader:
+    """Wraps a module loader and reports how long executing the module took"""
+
+    def __init__(self, loader, profile, name):
+        self._loader = loader
+        self._profile = profile
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profile._import_started()
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile._import_finished(self._name, time.perf_counter() - started)
+
+
+class _ImportTimer(MetaPathFinder):
+    """Meta path hook that times every module imported after it is installed"""
+
+    def __init__(self, profile):
+        self._profile = profile
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Let the regular finders locate the module, then wrap its loader
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is None or not hasattr(spec.loader, 'exec_module'):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, self._profile, fullname)
+        return spec
+
+
+class StartupProfile:
+    """Import and screen construction timings for the startup report.
+
+    Disabled unless the GUA_STARTUP_PROFILE environment variable is set.
+    When enabled, every module imported after start() is timed (self time
+    and time including its own imports, like python -X importtime), as is
+    each screen's first construction. The report is written to
+    ~/.gua_app/startup_profile.txt at the first frame and again on exit.
+    """
+
+    def __init__(self, enabled=None, report_path=None):
+        self.enabled = bool(os.environ.get(PROFILE_ENV)) if enabled is None else enabled
+        self.report_path = report_path or Path.home() / '.gua_app' / 'startup_profile.txt'
+        self.process_start = None
+        self.first_frame = None
+        self.imports = []       # (module, self seconds, total seconds)
+        self.screens = []       # (screen, import seconds, build seconds, seconds after start)
+        self._finder = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self, process_start):
+        """Install the import hook; process_start is the perf_counter() taken at launch"""
+        self.process_start = process_start
+        if self.enabled and self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def stop(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _import_started(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+
+    def _import_finished(self, name, elapsed):
+        stack = self._local.stack
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        with self._lock:
+            self.imports.append((name, elapsed - children, elapsed))
+
+    def record_screen(self, name, import_time, build_time):
+        if self.enabled:
+            with self._lock:
+                self.screens.append((name, import_time, build_time, self._since_start()))
+
+    def record_first_frame(self):
+        """Note the first frame and write the report; returns seconds since launch"""
+        self.first_frame = self._since_start()
+        if self.enabled:
+            self.write()
+        return self.first_frame
+
+    def _since_start(self):
+        return time.perf_counter() - self.process_start if self.process_start else 0.0
+
+    def report(self, top=40):
+        """Plain-text report, slowest imports first"""
+        with self._lock:
+            imports = list(self.imports)
+            screens = list(self.screens)
+        lines = ['G.U.A startup profile', '']
+        if self.first_frame is not None:
+            lines.append(f"First frame: {self.first_frame * 1000:.1f} ms after launch")
+        packages = {}
+        for name, own, _ in imports:
+            package = name.split('.')[0]
+            packages[package] = packages.get(package, 0.0) + own
+        lines.append(f"Modules imported: {len(imports)}, "
+                     f"total import time {sum(entry[1] for entry in imports) * 1000:.1f} ms")
+        lines.append('')
+
+        lines.append('Screens (first construction)')
+        lines.append(f"{'screen':<16}{'import ms':>11}{'build ms':>11}{'at ms':>10}")
+        for name, import_time, build_time, at in screens:
+            lines.append(f"{name:<16}{import_time * 1000:>11.1f}{build_time * 1000:>11.1f}{at * 1000:>10.0f}")
+        lines.append('')
+
+        lines.append('Packages by import time (all their modules)')
+        lines.append(f"{'ms':>9}  package")
+        for name, total in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"{total * 1000:>9.1f}  {name}")
+        lines.append('')
+
+        lines.append('Modules by self time')
+        lines.append(f"{'self ms':>9}{'cumulative ms':>15}  module")
+        for name, own, total in sorted(imports, key=lambda entry: -entry[1])[:top]:
+            lines.append(f"{own * 1000:>9.1f}{total * 1000:>15.1f}  {name}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(self.report(), encoding='utf-8')
+            print(f"Startup profile written to {self.report_path}")
+        except OSError as e:
+            print(f"Error writing startup profile: {e}")
+
+
+# Global startup profile instance
+startup_profile = StartupProfile()
@@ -1,98 +1,205 @@
-import json
-import os
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
+from config import HISTORY_CAPACITY, STORAGE_BACKEND, STORAGE_FLUSH_DELAY
+from utils.storage_backends import create_storage_backend
 
 
 class UserStorage:
-    """Handle user data storage locally"""
-    
-    def __init__(self):
+    """Handle user data storage locally.
+
+    Favorites, history and the user profile are loaded once and kept in
+    memory. Mutations mark the data dirty and a write-behind timer persists
+    them after flush_delay seconds, so a burst of changes costs one write.
+    Persistence is delegated to a backend ('json' files or 'sqlite' rows).
+    """
+
+    def __init__(self, flush_delay=STORAGE_FLUSH_DELAY, backend=STORAGE_BACKEND, history_capacity=HISTORY_CAPACITY):
         # Use app data directory
         self.data_dir = Path.home() / '.gua_app'
         self.data_dir.mkdir(exist_ok=True)
-        self.user_file = self.data_dir / 'user_data.json'
-        self.favorites_file = self.data_dir / 'favorites.json'
-        self.history_file = self.data_dir / 'history.json'
-    
+        self.backend = create_storage_backend(backend, self.data_dir)
+
+        self.flush_delay = flush_delay
+        self.history_capacity = history_capacity
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = self._no_changes()
+        self._flush_timer = None
+        self._loaded = False
+        self._user = None
+        self._favorites = {}
+        # Recently viewed, keyed by str(game id), least recent first
+        self._history = OrderedDict()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _no_changes():
+        return {'user': False, 'favorites': set(), 'history': set(), 'history_cleared': False}
+
+    def _ensure_loaded(self):
+        """Read all stored data the first time anything is accessed"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._user, self._favorites, history = self.backend.load()
+            self._history = OrderedDict((str(entry['id']), entry) for entry in history)
+            self._loaded = True
+
+    def _mark_dirty(self, name, game_id=None):
+        """Record a change and schedule a write-behind flush"""
+        if name in ('favorites', 'history'):
+            self._dirty[name].add(game_id)
+        else:
+            self._dirty[name] = True
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write pending changes to disk now"""
+        # Serialises flushes so an older snapshot never overwrites a newer one
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                changes, self._dirty = self._dirty, self._no_changes()
+                if changes == self._no_changes():
+                    return
+                state = {'user': self._user, 'favorites': self._favorites, 'history': self._history}
+                # Serialise under the lock; the slow disk I/O happens outside it
+                pending = self.backend.prepare(state, changes)
+
+            try:
+                self.backend.commit(pending)
+            except Exception as e:
+                print(f"Storage write error: {e}")
+                with self._lock:
+                    self._merge_changes(changes)
+
+    def _merge_changes(self, changes):
+        """Re-queue changes from a failed flush"""
+        self._dirty['user'] = self._dirty['user'] or changes['user']
+        self._dirty['history_cleared'] = self._dirty['history_cleared'] or changes['history_cleared']
+        self._dirty['favorites'] |= changes['favorites']
+        self._dirty['history'] |= changes['history']
+        self._schedule_flush()
+
     def save_user(self, user_data):
         """Save user login data"""
-        with open(self.user_file, 'w') as f:
-            json.dump(user_data, f)
-    
+        self._ensure_loaded()
+        with self._lock:
+            self._user = dict(user_data)
+            self._mark_dirty('user')
+
     def get_user(self):
         """Get logged in user data"""
-        if self.user_file.exists():
-            with open(self.user_file, 'r') as f:
-                return json.load(f)
-        return None
-    
+        self._ensure_loaded()
+        return dict(self._user) if self._user is not None else None
+
     def logout_user(self):
         """Remove user data (logout)"""
-        if self.user_file.exists():
-            os.remove(self.user_file)
-    
+        self._ensure_loaded()
+        with self._lock:
+            self._user = None
+            self._mark_dirty('user')
+
     def is_logged_in(self):
         """Check if user is logged in"""
-        return self.user_file.exists()
-    
+        self._ensure_loaded()
+        return self._user is not None
+
     def add_favorite(self, game_id, game_data):
         """Add game to favorites"""
-        favorites = self.get_favorites()
-        favorites[str(game_id)] = game_data
-        with open(self.favorites_file, 'w') as f:
-            json.dump(favorites, f)
-    
+        self._ensure_loaded()
+        with self._lock:
+            self._favorites[str(game_id)] = game_data
+            self._mark_dirty('favorites', str(game_id))
+
     def remove_favorite(self, game_id):
         """Remove game from favorites"""
-        favorites = self.get_favorites()
-        if str(game_id) in favorites:
-            del favorites[str(game_id)]
-            with open(self.favorites_file, 'w') as f:
-                json.dump(favorites, f)
-    
+        self._ensure_loaded()
+        with self._lock:
+            if self._favorites.pop(str(game_id), None) is not None:
+                self._mark_dirty('favorites', str(game_id))
+
     def get_favorites(self):
         """Get all favorite games"""
-        if self.favorites_file.exists():
-            with open(self.favorites_file, 'r') as f:
-                return json.load(f)
-        return {}
-    
+        self._ensure_loaded()
+        with self._lock:
+            return dict(self._favorites)
+
     def is_favorite(self, game_id):
         """Check if game is in favorites"""
-        favorites = self.get_favorites()
-        return str(game_id) in favorites
-    
+        self._ensure_loaded()
+        return str(game_id) in self._favorites
+
     def add_to_history(self, game_id, game_data):
-        """Add game to recently viewed"""
-        history = self.get_history()
-        # Keep only last 50 items
-        if len(history) >= 50:
-            history.pop(0)
-        # Remove if already exists and add to end
-        history = [h for h in history if h['id'] != game_id]
-        history.append({'id': game_id, **game_data})
-        with open(self.history_file, 'w') as f:
-            json.dump(history, f)
-    
+        """Add game to recently viewed, or move it to the front if already there"""
+        self._ensure_loaded()
+        with self._lock:
+            key = str(game_id)
+            previous = self._history.pop(key, None)
+            # Entries saved before view counts existed stand for one view
+            view_count = previous.get('view_count', 1) + 1 if previous else 1
+            self._history[key] = {
+                'id': game_id,
+                **game_data,
+                'viewed_at': time.time(),
+                'view_count': view_count
+            }
+            self._mark_dirty('history', key)
+            # Evict the least recently viewed games past capacity
+            while len(self._history) > self.history_capacity:
+                evicted_key, _ = self._history.popitem(last=False)
+                self._mark_dirty('history', evicted_key)
+
     def get_history(self):
-        """Get recently viewed games"""
-        if self.history_file.exists():
-            with open(self.history_file, 'r') as f:
-                return json.load(f)
-        return []
-    
+        """Get recently viewed games, oldest first"""
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._history.values())
+
+    def get_history_page(self, offset=0, limit=20):
+        """Get a page of recently viewed games, most recent first"""
+        self._ensure_loaded()
+        with self._lock:
+            return list(islice(reversed(self._history.values()), offset, offset + limit))
+
+    def get_history_entry(self, game_id):
+        """Get the history entry (with view_count and viewed_at) for a game"""
+        self._ensure_loaded()
+        entry = self._history.get(str(game_id))
+        return dict(entry) if entry is not None else None
+
+    def history_count(self):
+        self._ensure_loaded()
+        return len(self._history)
+
     def clear_history(self):
         """Clear viewing history"""
-        if self.history_file.exists():
-            os.remove(self.history_file)
-    
+        self._ensure_loaded()
+        with self._lock:
+            self._history = OrderedDict()
+            self._dirty['history'].clear()
+            self._mark_dirty('history_cleared')
+
     def get_stats(self):
         """Get user statistics"""
-        favorites = self.get_favorites()
-        history = self.get_history()
+        self._ensure_loaded()
         return {
-            'favorites': len(favorites),
-            'viewed': len(history),
+            'favorites': len(self._favorites),
+            'viewed': len(self._history),
             'reviews': 0  # Placeholder for future feature
         }
 
@@ -0,0 +1,200 @@
+import json
+import os
+import sqlite3
+import threading
+from utils.fileio import atomic_write, quarantine
+
+
+def _read_json(path, default, expected_type):
+    """Load JSON from path; corrupt files are quarantined and default returned"""
+    if not path.exists():
+        return default
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if not isinstance(data, expected_type):
+            raise ValueError(f"expected {expected_type.__name__}")
+        return data
+    except ValueError as e:
+        quarantine(path, e)
+        return default
+
+
+class JSONStorageBackend:
+    """user_data.json, favorites.json and history.json, rewritten whole on change"""
+
+    name = 'json'
+
+    def __init__(self, data_dir):
+        self.user_file = data_dir / 'user_data.json'
+        self.favorites_file = data_dir / 'favorites.json'
+        self.history_file = data_dir / 'history.json'
+
+    def load(self):
+        """Return (user, favorites, history)"""
+        return (
+            _read_json(self.user_file, None, dict),
+            _read_json(self.favorites_file, {}, dict),
+            _read_json(self.history_file, [], list),
+        )
+
+    def prepare(self, state, changes):
+        """Serialise the changed files; called with the storage lock held"""
+        pending = {}
+        if changes['user']:
+            pending[self.user_file] = None if state['user'] is None else json.dumps(state['user'])
+        if changes['favorites']:
+            pending[self.favorites_file] = json.dumps(state['favorites'])
+        if changes['history'] or changes['history_cleared']:
+            history = list(state['history'].values())
+            pending[self.history_file] = json.dumps(history) if history else None
+        return pending
+
+    def commit(self, pending):
+        """Write prepared changes; None removes the file (logout / cleared history)"""
+        for path, payload in pending.items():
+            if payload is None:
+                if path.exists():
+                    os.remove(path)
+            else:
+                atomic_write(path, payload)
+
+    def close(self):
+        pass
+
+
+class SQLiteStorageBackend:
+    """Favorites, history and user profile as rows in one SQLite database.
+
+    Each change is a single indexed upsert or delete instead of rewriting
+    the whole collection.
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS user (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS favorites (
+            game_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            added_at REAL NOT NULL DEFAULT (strftime('%s', 'now'))
+        );
+        CREATE TABLE IF NOT EXISTS history (
+            game_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            viewed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_history_viewed_at ON history (viewed_at);
+    """
+
+    def __init__(self, data_dir):
+        self.db_path = data_dir / 'user_data.db'
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+        self.migrate_from_json(JSONStorageBackend(data_dir))
+
+    def migrate_from_json(self, json_backend):
+        """Import legacy JSON files once, then rename them to *.migrated"""
+        files = [json_backend.user_file, json_backend.favorites_file, json_backend.history_file]
+        if not any(path.exists() for path in files):
+            return False
+
+        user, favorites, history = json_backend.load()
+        with self._lock, self._conn:
+            if user is not None:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO user (id, data) VALUES (1, ?)', (json.dumps(user),)
+                )
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO favorites (game_id, data) VALUES (?, ?)',
+                [(game_id, json.dumps(game)) for game_id, game in favorites.items()]
+            )
+            # Legacy history has no timestamps; keep its order
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO history (game_id, data, viewed_at) VALUES (?, ?, ?)',
+                [(str(game['id']), json.dumps(game), game.get('viewed_at', position))
+                 for position, game in enumerate(history)]
+            )
+
+        for path in files:
+            if path.exists():
+                os.replace(path, path.with_suffix('.migrated'))
+        print("Migrated user data to SQLite")
+        return True
+
+    def load(self):
+        """Return (user, favorites, history)"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM user WHERE id = 1').fetchone()
+            favorites = self._conn.execute('SELECT game_id, data FROM favorites ORDER BY added_at').fetchall()
+            history = self._conn.execute('SELECT data FROM history ORDER BY viewed_at').fetchall()
+        user = json.loads(row[0]) if row else None
+        return (
+            user,
+            {game_id: json.loads(data) for game_id, data in favorites},
+            [json.loads(data) for (data,) in history],
+        )
+
+    def prepare(self, state, changes):
+        """Collect row-level operations; called with the storage lock held"""
+        pending = {'user': None, 'favorites': [], 'history': [], 'history_cleared': changes['history_cleared']}
+        if changes['user']:
+            pending['user'] = ('set', None if state['user'] is None else json.dumps(state['user']))
+        for game_id in changes['favorites']:
+            game = state['favorites'].get(game_id)
+            pending['favorites'].append((game_id, None if game is None else json.dumps(game)))
+        for game_id in changes['history']:
+            entry = state['history'].get(game_id)
+            pending['history'].append(
+                (game_id, None if entry is None else json.dumps(entry),
+                 None if entry is None else entry.get('viewed_at', 0))
+            )
+        return pending
+
+    def commit(self, pending):
+        """Apply prepared row operations in one transaction"""
+        with self._lock, self._conn:
+            if pending['user'] is not None:
+                _, data = pending['user']
+                if data is None:
+                    self._conn.execute('DELETE FROM user WHERE id = 1')
+                else:
+                    self._conn.execute('INSERT OR REPLACE INTO user (id, data) VALUES (1, ?)', (data,))
+            for game_id, data in pending['favorites']:
+                if data is None:
+                    self._conn.execute('DELETE FROM favorites WHERE game_id = ?', (game_id,))
+                else:
+                    self._conn.execute(
+                        'INSERT INTO favorites (game_id, data) VALUES (?, ?) '
+                        'ON CONFLICT(game_id) DO UPDATE SET data = excluded.data',
+                        (game_id, data)
+                    )
+            if pending['history_cleared']:
+                self._conn.execute('DELETE FROM history')
+            for game_id, data, viewed_at in pending['history']:
+                if data is None:
+                    self._conn.execute('DELETE FROM history WHERE game_id = ?', (game_id,))
+                else:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO history (game_id, data, viewed_at) VALUES (?, ?, ?)',
+                        (game_id, data, viewed_at)
+                    )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_storage_backend(name, data_dir):
+    """Build a UserStorage backend by name ('json' or 'sqlite')"""
+    if name == 'json':
+        return JSONStorageBackend(data_dir)
+    if name == 'sqlite':
+        return SQLiteStorageBackend(data_dir)
+    raise ValueError(f"Unknown storage backend: {name}")
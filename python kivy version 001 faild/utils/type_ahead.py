@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+
+class TypeAhead:
+    """Bookkeeping for as-you-type search.
+
+    Remembers the first result page of recent queries so a query that
+    extends or trims one of them can be answered instantly by filtering
+    those results locally while the real request is in flight, and counts
+    keystrokes against the requests they caused.
+    """
+
+    def __init__(self, max_queries=20):
+        self.max_queries = max_queries
+        self._results = OrderedDict()
+        self.stats = {
+            'keystrokes': 0, 'requests': 0, 'superseded': 0,
+            'local_hits': 0, 'index_hits': 0, 'skipped': 0
+        }
+
+    def record(self, name):
+        """Count a keystroke, request, superseded request, index hit or skipped duplicate"""
+        self.stats[name] += 1
+
+    @staticmethod
+    def normalize(query):
+        return ' '.join(query.casefold().split())
+
+    def remember(self, query, games):
+        """Keep the first page of results for query"""
+        query = self.normalize(query)
+        self._results.pop(query, None)
+        self._results[query] = games
+        while len(self._results) > self.max_queries:
+            self._results.popitem(last=False)
+
+    def local_results(self, query):
+        """Best-effort results for query from a remembered related query, or None.
+
+        Exact matches are returned as is. Otherwise the closest remembered
+        query that is a prefix of query (or that query is a prefix of) is
+        used, keeping only games whose name contains every word typed.
+        """
+        query = self.normalize(query)
+        if query in self._results:
+            self._results.move_to_end(query)
+            self.stats['local_hits'] += 1
+            return self._results[query]
+
+        related = [known for known in self._results if query.startswith(known) or known.startswith(query)]
+        if not related:
+            return None
+        closest = min(related, key=lambda known: abs(len(known) - len(query)))
+        words = query.split()
+        games = [
+            game for game in self._results[closest]
+            if all(word in (game.get('name') or '').casefold() for word in words)
+        ]
+        if not games:
+            return None
+        self.stats['local_hits'] += 1
+        return games
+
+    def get_stats(self):
+        """Counters plus requests per keystroke for this session"""
+        stats = dict(self.stats)
+        keystrokes = stats['keystrokes']
+        stats['requests_per_keystroke'] = round(stats['requests'] / keystrokes, 3) if keystrokes else 0.0
+        return stats